@@ -1,6 +1,6 @@
 """Configuration settings for the Minesweeper solver."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import os
 
 # File paths
@@ -15,6 +15,14 @@ INTERSECTION2 = os.path.join(TEMPLATE_DIR, "intersection2.png")
 MAX_ITERATIONS = 100
 MOVE_DELAY = 1.0  # seconds to wait between moves
 SETUP_DELAY = 3.0  # seconds to wait during setup
+SOLVE_BUDGET_MS = 500.0  # time budget for each solver decision
+
+# Mine count of each Google Minesweeper difficulty, keyed by (rows, cols)
+BOARD_PRESETS = {
+    (8, 10): 10,  # easy
+    (14, 18): 40,  # medium
+    (20, 24): 99,  # hard
+}
 
 # Image processing settings
 SIMILARITY_THRESHOLD = 0.8  # threshold for image matching
@@ -26,10 +34,25 @@ class SolverConfig:
     
     def __init__(self):
         self.debug_mode = False
-        self.save_screenshots = True
+        self.save_screenshots = False  # write each capture to template/state.png (background thread)
         self.max_iterations = MAX_ITERATIONS
         self.move_delay = MOVE_DELAY
         self.setup_delay = SETUP_DELAY
+        # Deduction tiers tried after the trivial rules: 'subset', 'linear';
+        # 'sampling' estimates frontier components too large to enumerate
+        self.deduction_tiers = ['subset', 'sampling']
+        self.sampler_workers = 1
+        self.solve_budget_ms = SOLVE_BUDGET_MS
+        self.total_mines = None  # None: look the board size up in BOARD_PRESETS
+        self.pipelined = False  # capture, solve and click on separate threads (process.pipeline)
+        # Screen grabber: 'auto' (mss if available, else pyautogui), 'mss', 'pyautogui'
+        # or 'replay' (play back the screenshots or video at replay_path)
+        self.capture_backend = 'auto'
+        self.replay_path = None
+        self.continuous_capture = False  # with pipelined, grab the board continuously on its own thread
+        # 'flag' right-clicks every mine found; 'none' only tracks mines in the solver;
+        # 'chord' flags just the mines needed to chord numbers when that saves clicks
+        self.flag_mode = 'flag'
         
     def to_dict(self) -> Dict[str, Any]:
         """Convert configuration to dictionary."""
@@ -38,7 +61,16 @@ class SolverConfig:
             'save_screenshots': self.save_screenshots,
             'max_iterations': self.max_iterations,
             'move_delay': self.move_delay,
-            'setup_delay': self.setup_delay
+            'setup_delay': self.setup_delay,
+            'deduction_tiers': self.deduction_tiers,
+            'solve_budget_ms': self.solve_budget_ms,
+            'sampler_workers': self.sampler_workers,
+            'total_mines': self.total_mines,
+            'pipelined': self.pipelined,
+            'capture_backend': self.capture_backend,
+            'replay_path': self.replay_path,
+            'continuous_capture': self.continuous_capture,
+            'flag_mode': self.flag_mode
         }
         
     @classmethod
@@ -50,6 +82,21 @@ class SolverConfig:
                 setattr(config, key, value)
         return config
 
+    def mine_count(self, rows: int, cols: int) -> Optional[int]:
+        """Total mines for a board, from the configuration or the known presets.
+
+        Args:
+            rows: Number of rows on the board
+            cols: Number of columns on the board
+
+        Returns:
+            The number of mines, or None if it is not configured and the size
+            matches no preset
+        """
+        if self.total_mines is not None:
+            return self.total_mines
+        return BOARD_PRESETS.get((rows, cols), BOARD_PRESETS.get((cols, rows)))
+
 # Logging settings
 LOGGING_CONFIG = {
     'version': 1,
@@ -1,13 +1,21 @@
-from read.capture import capture_board, get_board_region, capture_tile
+from read.capture import capture_board, capture_regions, get_board_region, capture_tile, initialize_capture_backend
+from read.capture_backend import create_backend, FrameStream
+from read.frame import Frame
+from read.wait_for_change import ChangeWaiter
 from read.get_starter_template import get_starter_template
 from read.detect_grid_intersections_on_board import detect_grid_intersections_on_board
 from process.convert_to_2d_tiles_coordinate_list import find_list_dimension, convert_to_2d_tiles_list
 from write.click import *
-from read.read_board_numbers import read_board_numbers
+from write.batch import dispatch_batch, mouse_start, plan_path
+from read.read_board_numbers import read_board_numbers, classify_changed_tiles, classify_tile_frames
+from read.tile_classifier import UNOPENED, MINE, UNRECOGNIZED
 from read.get_tile_number import *
 from process.get_tile_region import *
 from process.update_around_empty_tile import update_around_empty_tile
+from process.frame_diff import FrameDiffer
+from process.pipeline import Pipeline
 from solver.solver_logic import SolverLogic
+from config import SolverConfig
 from PIL import Image
 import os
 import time
@@ -15,26 +23,14 @@ import cv2
 import numpy as np
 
 
-if not os.path.exists('template'):
-    os.mkdir('template')
-
-board_region = get_board_region()
-
-capture_board("state.png", board_region)
-get_starter_template("state.png", "default_tile1.png", "default_tile2.png")
-intersections = detect_grid_intersections_on_board("state.png", "intersection1.png", "intersection2.png")
-row, col = find_list_dimension(intersections)
-grid_coordinates = convert_to_2d_tiles_list(intersections)
-tile_width = grid_coordinates[0][1][0] - grid_coordinates[0][0][0]
-tile_height = grid_coordinates[1][0][1] - grid_coordinates[0][0][1]
-initialize_tile_dimensions(tile_width, tile_height)
-
-solver = SolverLogic(row, col)
-tile_regions = get_all_tile_regions(grid_coordinates)
-
 def update_board_state(r: int, c: int) -> bool:
     """Update the board state after a move.
     
+    The clicked tile is verified with a grab of just that tile. Only when it
+    is a 0, which opens a region, is the whole board captured; then only the
+    unknown tiles whose pixels changed since the previous capture are
+    classified, in one batch.
+    
     Args:
         r: Row index
         c: Column index
@@ -43,25 +39,32 @@ def update_board_state(r: int, c: int) -> bool:
         bool: True if the update was successful, False if the game is over
     """
     try:
-        capture_board("state.png", board_region)
-        image = Image.open("template/state.png")
-        number = get_tile_number(capture_tile(image, tile_regions[r][c]))
+        state = classify_tile_frames(capture_regions(board_region, [tile_regions[r][c]]), [(r, c)])[(r, c)]
+        changes = {(r, c): state}
+        if state == UNOPENED:
+            print(f"Cell ({r}, {c}) has not been revealed yet")
+            frame_differ.mark_pending([(r, c)])
+            return True
         
-        # Check if we hit a mine
-        if number == 'X' or number == 'x':
+        # Check if we hit a mine (a revealed mine may match no learned reference)
+        if state in (MINE, UNRECOGNIZED):
             print(f"Hit a mine at ({r}, {c})!")
             solver.update_cell(r, c, -1)  # Use update_cell instead of direct assignment
             return False
             
-        # If we got a number, update the cell value
-        if number != '':
-            value = int(number)
-            solver.update_cell(r, c, value)
-            print(f"Updated cell ({r}, {c}) with value {value}")
-        else:    
-            # Process empty tiles
-            solver.update_cell(r, c, 0)
-            update_around_empty_tile(r, c, solver, tile_regions)
+        solver.update_cell(r, c, state)
+        if state == 0:
+            # An empty tile opens a region: read the unknown tiles that changed in this capture
+            frame = capture_board(board_region, screenshot_file)
+            changes = update_around_empty_tile(solver, frame, tile_regions, frame_differ.update(frame))
+            revealed = sum(value >= 0 for value in changes.values())
+            print(f"Processed zero cell at ({r}, {c}), revealed {revealed} more cells")
+        else:
+            print(f"Updated cell ({r}, {c}) with value {state}")
+        frame_differ.mark_pending(
+            (tr, tc) for (tr, tc), value in changes.items()
+            if value == UNOPENED and solver.grid[tr][tc].value is None and not solver.grid[tr][tc].is_flagged
+        )
             
         return True
     except Exception as e:
@@ -90,42 +93,125 @@ def make_move(r: int, c: int, is_flag: bool = False) -> bool:
             print(f"Skipping already flagged cell ({r}, {c})")
             return True
  
+        # Wait for the tile to change and settle rather than sleeping a fixed time
+        baseline = change_waiter.grab(tile_regions[r][c])
         if is_flag:
             print(f"Flagging cell ({r}, {c})")
             flag_at(grid_coordinates[r][c][0], grid_coordinates[r][c][1])
-            time.sleep(0.3)  # Increased delay after flagging
+            change_waiter.wait(tile_regions[r][c], baseline)
+            placed_flags.add((r, c))
             solver.update_cell(r, c, -1)
         else:
             print(f"Clicking cell ({r}, {c})")
             click_at(grid_coordinates[r][c][0], grid_coordinates[r][c][1])
-            time.sleep(1)  # Increased delay after clicking
+            if change_waiter.wait(tile_regions[r][c], baseline) is None:
+                print(f"Cell ({r}, {c}) did not change within {change_waiter.timeout:.2f}s")
             
             # Update board state after clicking
-            capture_board("state.png", board_region)
-            image = Image.open("template/state.png")
-            number = get_tile_number(capture_tile(image, tile_regions[r][c]))
-            # Check if we hit a mine
-            if number == 'X' or number == 'x':
-                print(f"Hit a mine at ({r}, {c})!")
-                solver.update_cell(r, c, -1)  # Use update_cell instead of direct assignment
+            if not update_board_state(r, c):
                 return False
                 
-            # If we got a number, update the cell value
-            if number != '':
-                value = int(number)
-                solver.update_cell(r, c, value)
-                print(f"Updated cell ({r}, {c}) with value {value}")
-            else:    
-                # Process empty tiles
-                solver.update_cell(r, c, 0)
-                print(f"Processing zero cell at ({r}, {c})")
-                update_around_empty_tile(r, c, solver,image, tile_regions)
-                
         return True
     except Exception as e:
         print(f"Error making move {r}, {c}: {str(e)}")
         return False
 
+def make_first_move() -> bool:
+    """Open the solver's first guess and calibrate the classifier from it.
+    
+    The clicked tile and any neighbours it opened are the first revealed
+    tiles on this board: their background becomes the classifier's
+    revealed reference before anything is read.
+    
+    Returns:
+        bool: True if the move was successful, False if the game is over
+    """
+    first_move = solver.solve(budget_ms=solver_config.solve_budget_ms).guess
+    if not first_move:
+        return True
+    r, c = first_move
+    print(f"Opening cell ({r}, {c})")
+    baseline = change_waiter.grab(tile_regions[r][c])
+    click_at(grid_coordinates[r][c][0], grid_coordinates[r][c][1])
+    change_waiter.wait(tile_regions[r][c], baseline)
+    around = [
+        tile_regions[nr][nc]
+        for nr in range(max(r - 1, 0), min(r + 2, row))
+        for nc in range(max(c - 1, 0), min(c + 2, col))
+    ]
+    calibrate_classifier(capture_regions(board_region, around))
+    return update_board_state(r, c)
+
+def make_batch_moves(cells, is_flag: bool = False, chord_numbers=()) -> bool:
+    """Click (or flag) a batch of certain cells and verify them with one capture.
+    
+    The cells are visited along a short mouse path without screenshots in
+    between; after the last one settles the board is read once and every
+    revealed tile is applied to the solver.
+    
+    Args:
+        cells: (row, col) cells to act on
+        is_flag: Whether to flag the cells instead of clicking them
+        chord_numbers: Revealed numbers to click as chords in the same batch
+        
+    Returns:
+        bool: True if the batch was successful, False if the game is over
+    """
+    if is_flag:
+        cells = [cell for cell in cells if cell not in placed_flags]
+    else:
+        cells = [(r, c) for r, c in cells if solver.grid[r][c].value is None] + list(chord_numbers)
+    if not cells:
+        return True
+    order = plan_path(cells, grid_coordinates, mouse_start())
+    last = order[-1]
+    baseline = change_waiter.grab(tile_regions[last[0]][last[1]])
+    print(f"{'Flagging' if is_flag else 'Clicking'} {len(order)} cells")
+    dispatch_batch(order, grid_coordinates, flag=is_flag, plan=False)
+    change_waiter.wait(tile_regions[last[0]][last[1]], baseline)
+    if is_flag:
+        placed_flags.update(order)
+        solver.update_cells({cell: -1 for cell in order})
+        return True
+    
+    changes = read_board_changes()
+    # Flags read as mines too; any other mine means a click (or chord) hit one
+    hits = [
+        cell for cell, value in changes.items()
+        if (value == MINE and cell not in placed_flags) or (value == UNRECOGNIZED and cell in order)
+    ]
+    if hits:
+        print(f"Hit a mine in batch: {hits}")
+        return False
+    solver.update_cells({
+        (tr, tc): value for (tr, tc), value in changes.items()
+        if value >= 0 and solver.grid[tr][tc].value is None
+    })
+    # Clicked tiles not shown as revealed yet are read again on the next capture
+    frame_differ.mark_pending(cell for cell in order if solver.grid[cell[0]][cell[1]].value is None)
+    return True
+
+def make_chord_moves(safe) -> bool:
+    """Open a set of safe cells, chording numbers where that takes fewer actions.
+    
+    Only the mines the chosen chords need are flagged on screen; the other
+    safe cells are clicked individually in the same batch.
+    
+    Args:
+        safe: Certainly safe (row, col) cells
+        
+    Returns:
+        bool: True if the moves were successful, False if the game is over
+    """
+    chords = solver.plan_chords(set(safe), placed_flags)
+    flags = set().union(*(chord.flags for chord in chords))
+    if flags and not make_batch_moves(flags, is_flag=True):
+        return False
+    opened = set().union(*(chord.opens for chord in chords))
+    if chords:
+        print(f"Chording {len(chords)} numbers to open {len(opened)} cells")
+    return make_batch_moves(set(safe) - opened, chord_numbers=[chord.number for chord in chords])
+
 def check_game_state() -> bool:
     """Check if the game is still in progress.
     
@@ -133,80 +219,131 @@ def check_game_state() -> bool:
         bool: True if the game should continue, False if it's over
     """
     # Check if all non-mine cells are revealed
-    for r in range(row):
-        for c in range(col):
-            cell = solver.grid[r][c]
-            if not cell.is_flagged and cell.value is None:
-                return True
-    return False
-
-# Make first move
-initialization_click(board_region, tile_width, tile_height)
-guess_set = solver.make_educated_guess()
-if guess_set:
-    # Convert set to tuple
-    r, c = next(iter(guess_set))
-    print(f"Guessing cell ({r}, {c}) with probability {solver.grid[r][c].probability:.2f}")
-    if not make_move(r, c):
-        print("Game over - hit a mine while making educated guess")
+    return bool(solver.unopened_mask().any())
+
+def read_board_changes() -> dict:
+    """Capture the board and classify the tiles that changed since the last capture.
+
+    Tiles that still read as unopened are re-checked on the next capture, in
+    case they were caught mid-animation.
+
+    Returns:
+        dict: Mapping of (row, col) to tile state for every changed tile
+    """
+    if frame_stream is not None:
+        # Ring-buffer frames are reused by the capture thread: keep a copy as the diff baseline
+        _, frame = frame_stream.wait_for_frame(timeout=solver_config.move_delay)
+        frame = Frame(frame.array.copy())
+    else:
+        frame = capture_board(board_region, screenshot_file)
+    changes = classify_changed_tiles(frame, tile_regions, frame_differ.update(frame))
+    frame_differ.mark_pending(position for position, value in changes.items() if value == UNOPENED)
+    return changes
+
+# Sampler worker processes re-import this module on spawn platforms (macOS, Windows)
+if __name__ == '__main__':
+    if not os.path.exists('template'):
+        os.mkdir('template')
+
+    solver_config = SolverConfig()
+    screenshot_file = "state.png" if solver_config.save_screenshots else None
+    capture_backend = create_backend(solver_config.capture_backend, solver_config.replay_path)
+    initialize_capture_backend(capture_backend)
+
+    board_region = get_board_region(solver_config.setup_delay)
+
+    frame = capture_board(board_region, screenshot_file)
+    get_starter_template(frame, "default_tile1.png", "default_tile2.png")
+    initialize_classifier([Image.open("template/default_tile1.png"), Image.open("template/default_tile2.png")])
+    intersections = detect_grid_intersections_on_board(frame, "intersection1.png", "intersection2.png")
+    row, col = find_list_dimension(intersections)
+    grid_coordinates = convert_to_2d_tiles_list(intersections)
+    tile_width = grid_coordinates[0][1][0] - grid_coordinates[0][0][0]
+    tile_height = grid_coordinates[1][0][1] - grid_coordinates[0][0][1]
+    initialize_tile_dimensions(tile_width, tile_height)
+
+    total_mines = solver_config.mine_count(row, col)
+    print(f"Board is {row}x{col} with {total_mines if total_mines is not None else 'an unknown number of'} mines")
+    solver = SolverLogic(row, col, tiers=solver_config.deduction_tiers,
+                         sampler_workers=solver_config.sampler_workers, total_mines=total_mines)
+    tile_regions = get_all_tile_regions(grid_coordinates)
+    frame_differ = FrameDiffer(tile_regions)
+    frame_differ.update(frame)
+    change_waiter = ChangeWaiter(board_region, initial_timeout=solver_config.move_delay)
+    placed_flags = set()  # mines flagged on screen; with flag_mode 'none'/'chord' the solver knows more
+
+    initialization_click(board_region, tile_width, tile_height)
+    if not make_first_move():
+        print("Game over - hit a mine on the first move")
         exit(1)
-# Main solving loop
-max_iterations = 100
-for iteration in range(max_iterations):
-    print(f"\nIteration {iteration + 1}")
+    frame_stream = None
+    if solver_config.pipelined:
+        if solver_config.continuous_capture:
+            frame_stream = FrameStream(capture_backend, board_region).start()
+        # Capture, solve and click on separate threads until the game ends
+        pipeline = Pipeline(
+            solver, read_board_changes,
+            click=lambda r, c: click_at(*grid_coordinates[r][c]),
+            flag=(lambda r, c: flag_at(*grid_coordinates[r][c])) if solver_config.flag_mode != 'none' else None,
+            budget_ms=solver_config.solve_budget_ms, chord=solver_config.flag_mode == 'chord')
+        outcome = pipeline.run()
+        if frame_stream is not None:
+            frame_stream.stop()
+        print(f"Game {outcome} after {pipeline.decisions} solver decisions")
+        exit(0 if outcome == 'won' else 1)
+
+    # Main solving loop
+    max_iterations = solver_config.max_iterations
+    for iteration in range(max_iterations):
+        print(f"\nIteration {iteration + 1}")
+        result = solver.solve(budget_ms=solver_config.solve_budget_ms)
+        print(f"Solver ran {', '.join(result.tiers_run)} in {result.elapsed_ms:.1f} ms")
     
-    # Always check for mines first
-    mines = solver.find_certain_mines()
-    if mines:
-        print(f"Found {len(mines)} certain mines")
-        for r, c in mines:
-            print(f"Flagging mine at ({r}, {c})")
-            if not make_move(r, c, is_flag=True):
+        # Always flag mines first
+        if result.mines:
+            print(f"Found {len(result.mines)} certain mines")
+            if solver_config.flag_mode != 'flag':
+                # Mines are only bookkeeping for the solver: skip the right-clicks
+                solver.update_cells({cell: -1 for cell in result.mines})
+            elif not make_batch_moves(result.mines, is_flag=True):
                 print("Game over - hit a mine while flagging")
                 exit(1)
-        # After flagging mines, check for safe moves
-        continue
+            # After flagging mines, check for safe moves
+            continue
     
-    # Only proceed to safe moves if no mines are found
-    safe_moves = solver.find_safe_moves()
-    if safe_moves:
-        print(f"Found {len(safe_moves)} safe moves")
-        for r, c in safe_moves:
-            if not make_move(r, c):
+        if result.safe:
+            print(f"Found {len(result.safe)} safe moves")
+            moved = make_chord_moves(result.safe) if solver_config.flag_mode == 'chord' else make_batch_moves(result.safe)
+            if not moved:
                 print("Game over - hit a mine while making safe move")
                 exit(1)
-        # After making safe moves, go back to check for mines
-        continue
+            # After making safe moves, go back to check for mines
+            continue
     
-    # Make educated guess only if no mines or safe moves
-    print("No certain moves available, making educated guess")
-    guess_set = solver.make_educated_guess()
-    if guess_set and not safe_moves and not mines:
-        # Convert set to tuple
-        r, c = next(iter(guess_set))
-        print(f"Guessing cell ({r}, {c}) with probability {solver.grid[r][c].probability:.2f}")
-        if not make_move(r, c):
-            print("Game over - hit a mine while making educated guess")
-            exit(1)
+        # Make educated guess only if no mines or safe moves
+        if result.guess:
+            r, c = result.guess
+            error = f" ± {result.stderr:.2f}" if result.stderr else ""
+            print(f"No certain moves available, guessing cell ({r}, {c}) with confidence {result.confidence:.2f}{error}")
+            if not make_move(r, c):
+                print("Game over - hit a mine while making educated guess")
+                exit(1)
     
-    # Check if game is complete
-    if not check_game_state():
-        print("Game completed successfully!")
-        break
-
-    # Add a small delay between iterations to prevent race conditions
-    time.sleep(0.1)
-    print(f"Current board state({iteration}):")
+        # Check if game is complete
+        if not check_game_state():
+            print("Game completed successfully!")
+            break
+
+        # Add a small delay between iterations to prevent race conditions
+        time.sleep(0.1)
+        print(f"Current board state({iteration}):")
+        for r in range(row):
+            for c in range(col):
+                cell = solver.grid[r][c]
+                print(f"Cell ({r}, {c}) → {cell.value if cell.value is not None else '?'}")
+
+    print("\nFinal board state:")
     for r in range(row):
         for c in range(col):
             cell = solver.grid[r][c]
             print(f"Cell ({r}, {c}) → {cell.value if cell.value is not None else '?'}")
-
-print("\nFinal board state:")
-for r in range(row):
-    for c in range(col):
-        cell = solver.grid[r][c]
-        print(f"Cell ({r}, {c}) → {cell.value if cell.value is not None else '?'}")
-    
-    
-
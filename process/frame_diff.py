@@ -0,0 +1,73 @@
+import cv2
+import numpy as np
+from process.get_tile_region import get_tile_views
+
+def changed_tiles(previous, current, tile_regions, threshold=8.0):
+    """
+    Compute which tiles differ between two captures of the board.
+
+    The absolute difference of the frames is reduced per tile block in one
+    vectorized call.
+
+    Args:
+        previous (Frame or np.ndarray): The earlier capture.
+        current (Frame or np.ndarray): The later capture.
+        tile_regions (list): The regions of each tile in the board.
+        threshold (float): Mean absolute pixel difference above which a tile counts as changed.
+
+    Returns:
+        np.ndarray: (rows, cols) boolean mask of changed tiles.
+    """
+    diff = cv2.absdiff(np.asarray(previous), np.asarray(current))
+    blocks = get_tile_views(diff, tile_regions)
+    return blocks.mean(axis=(2, 3, 4)) > threshold
+
+class FrameDiffer:
+    """
+    Keep the previous board frame and report the tiles changed since then.
+    """
+
+    def __init__(self, tile_regions, threshold=8.0):
+        """
+        Args:
+            tile_regions (list): The regions of each tile in the board.
+            threshold (float): Mean absolute pixel difference above which a tile counts as changed.
+        """
+        self.tile_regions = tile_regions
+        self.threshold = threshold
+        self.previous = None
+        self.pending = np.zeros((len(tile_regions), len(tile_regions[0])), dtype=bool)
+
+    def update(self, frame):
+        """
+        Diff a new frame against the previous one and keep it as the new baseline.
+
+        Tiles passed to mark_pending() since the last update are reported
+        again even if their pixels did not change.
+
+        Args:
+            frame (Frame): The new capture.
+
+        Returns:
+            np.ndarray: (rows, cols) boolean mask of tiles to re-read. Every tile
+                        is reported for the first frame.
+        """
+        if self.previous is None:
+            changed = np.ones_like(self.pending)
+        else:
+            changed = changed_tiles(self.previous, frame, self.tile_regions, self.threshold)
+        changed |= self.pending
+        self.pending[:] = False
+        self.previous = frame
+        return changed
+
+    def mark_pending(self, positions):
+        """
+        Force tiles to be re-read on the next update, e.g. when a tile was
+        caught mid-animation and still classified as unopened.
+
+        Args:
+            positions (iterable): (row, col) tuples of tiles to re-read.
+        """
+        for row, col in positions:
+            self.pending[row, col] = True
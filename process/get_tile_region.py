@@ -1,3 +1,5 @@
+import numpy as np
+
 tile_width = 0
 tile_height = 0
 
@@ -42,4 +44,74 @@ def get_all_tile_regions(grid_coordinates):
         list: A list of regions for each tile in the grid.
     """
     return [[get_tile_region(row, col, grid_coordinates) for col in range(len(grid_coordinates[0]))] for row in range(len(grid_coordinates))]
-    
\ No newline at end of file
+    
+def get_tile_views(board, tile_regions):
+    """
+    Get every tile of the board as one (rows, cols, h, w, channels) array.
+
+    When the tiles sit on a uniform pitch the result is a strided view into
+    the board with no copies; otherwise the tiles are gathered in a single
+    fancy-indexing call.
+
+    Args:
+        board (np.ndarray): The board screenshot as an (H, W, channels) array.
+        tile_regions (list): The regions of each tile as returned by get_all_tile_regions.
+
+    Returns:
+        np.ndarray: The tiles of the board.
+    """
+    regions = np.asarray(tile_regions)
+    rows, cols = regions.shape[:2]
+    lefts, tops = regions[..., 0], regions[..., 1]
+    width = int(regions[0, 0, 2] - regions[0, 0, 0])
+    height = int(regions[0, 0, 3] - regions[0, 0, 1])
+
+    dy = int(tops[1, 0] - tops[0, 0]) if rows > 1 else 0
+    dx = int(lefts[0, 1] - lefts[0, 0]) if cols > 1 else 0
+    uniform = (
+        (tops == tops[0, 0] + dy * np.arange(rows)[:, None]).all() and
+        (lefts == lefts[0, 0] + dx * np.arange(cols)[None, :]).all()
+    )
+    in_bounds = (
+        tops.min() >= 0 and lefts.min() >= 0 and
+        tops.max() + height <= board.shape[0] and lefts.max() + width <= board.shape[1]
+    )
+
+    if uniform and in_bounds and dx > 0 and dy > 0:
+        origin = board[tops[0, 0]:, lefts[0, 0]:]
+        row_stride, col_stride = board.strides[:2]
+        return np.lib.stride_tricks.as_strided(
+            origin,
+            shape=(rows, cols, height, width) + board.shape[2:],
+            strides=(dy * row_stride, dx * col_stride, row_stride, col_stride) + board.strides[2:],
+            writeable=False)
+
+    return _gather(board, tops, lefts, height, width)
+
+def get_tiles_at(board, tile_regions, rows, cols):
+    """
+    Get only the listed tiles of the board as one (n, h, w, channels) array.
+
+    Only the selected regions are gathered, whatever the pitch of the grid,
+    so reading a handful of changed tiles does not copy the whole board.
+
+    Args:
+        board (np.ndarray): The board screenshot as an (H, W, channels) array.
+        tile_regions (list): The regions of each tile as returned by get_all_tile_regions.
+        rows (np.ndarray): Row index of each tile to get.
+        cols (np.ndarray): Column index of each tile to get.
+
+    Returns:
+        np.ndarray: The selected tiles, in the order given.
+    """
+    regions = np.asarray(tile_regions)
+    width = int(regions[0, 0, 2] - regions[0, 0, 0])
+    height = int(regions[0, 0, 3] - regions[0, 0, 1])
+    selected = regions[rows, cols]
+    return _gather(board, selected[:, 1], selected[:, 0], height, width)
+
+def _gather(board, tops, lefts, height, width):
+    """Copy the tiles at the given corners out of the board in a single fancy-indexing call."""
+    ys = np.clip(tops[..., None] + np.arange(height), 0, board.shape[0] - 1)
+    xs = np.clip(lefts[..., None] + np.arange(width), 0, board.shape[1] - 1)
+    return board[ys[..., :, None], xs[..., None, :]]
@@ -0,0 +1,233 @@
+"""Pipelined capture / solve / act loop running on worker threads.
+
+Three threads share the work of main.py's sequential loop:
+
+- the capture thread repeatedly reads the board (capture + classification
+  of the tiles that changed) and publishes versioned snapshots;
+- the solver thread owns the SolverLogic instance, applies snapshots in
+  order and queues the moves it finds;
+- the action thread dispatches queued clicks, flags and chords back-to-back.
+
+Only the solver thread touches the solver, so its state is always
+consistent. Every snapshot records how many actions had completed before
+its capture started; certain moves are issued from any snapshot (a safe
+cell stays safe), but a guess is only made from a snapshot taken after
+every issued action has completed and been observed.
+"""
+
+from typing import Callable, Dict, Optional, Set, Tuple
+from dataclasses import dataclass, field
+import logging
+import queue
+import threading
+import time
+
+from read.tile_classifier import MINE, UNOPENED, UNRECOGNIZED
+
+logger = logging.getLogger(__name__)
+
+Position = Tuple[int, int]
+
+CAPTURE_INTERVAL = 0.02  # seconds between board reads
+REISSUE_TIMEOUT = 1.5  # seconds before a click that revealed nothing is sent again
+
+@dataclass
+class BoardSnapshot:
+    """Tiles that changed in one capture."""
+    version: int  # capture sequence number
+    after_action: int  # actions completed before the capture started
+    changes: Dict[Position, int] = field(default_factory=dict)
+
+@dataclass
+class Action:
+    """A click, flag or chord queued for the action thread."""
+    kind: str  # 'click', 'flag' or 'chord'
+    cell: Position
+    sequence: int  # 1-based order in which actions were queued
+
+class Pipeline:
+    """Run capture, solving and actions concurrently until the game ends."""
+
+    def __init__(self, solver, read_changes: Callable[[], Dict[Position, int]],
+                 click: Callable[[int, int], None], flag: Optional[Callable[[int, int], None]],
+                 budget_ms: Optional[float] = None, capture_interval: float = CAPTURE_INTERVAL,
+                 max_decisions: Optional[int] = None, chord: bool = False):
+        """Set up the pipeline.
+
+        Args:
+            solver: SolverLogic for the board; only used from the solver thread
+            read_changes: Captures the board and returns {(row, col): state}
+                for the tiles that changed since the previous call
+            click: Clicks a tile given its (row, col)
+            flag: Flags a tile given its (row, col), or None to keep mines
+                in the solver only and never flag them on screen
+            budget_ms: Time budget for each SolverLogic.solve call
+            capture_interval: Seconds between board reads
+            max_decisions: Stop after this many solve calls
+            chord: Open safe cells by chording numbers where that takes fewer
+                actions, flagging only the mines those chords need (a chord is
+                a click on the number, so flag must be given)
+        """
+        if chord and flag is None:
+            raise ValueError("Chording needs a flag callback")
+        self.solver = solver
+        self.read_changes = read_changes
+        self.click = click
+        self.flag = flag
+        self.budget_ms = budget_ms
+        self.capture_interval = capture_interval
+        self.max_decisions = max_decisions
+        self.chord = chord
+        self.outcome: Optional[str] = None  # 'won', 'lost' or 'stopped'
+        self.decisions = 0
+        self._snapshots: 'queue.Queue[BoardSnapshot]' = queue.Queue()
+        self._actions: 'queue.Queue[Optional[Action]]' = queue.Queue()
+        self._stop = threading.Event()
+        self._completed = 0  # actions completed, written by the action thread only
+        self._queued = 0  # actions queued, written by the solver thread only
+        self._clicked: Dict[Position, Tuple[int, float]] = {}  # in flight: (sequence, time queued)
+        self._flagged: Set[Position] = set()  # flags queued on screen, solver thread only
+        self._error: Optional[BaseException] = None
+
+    def run(self) -> str:
+        """Start the worker threads and block until the game is over.
+
+        Returns:
+            str: 'won', 'lost' or 'stopped'
+        """
+        threads = [threading.Thread(target=self._guard, args=(loop,), name=name, daemon=True)
+                   for name, loop in (('capture', self._capture_loop), ('solver', self._solve_loop),
+                                      ('action', self._action_loop))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if self._error is not None:
+            raise self._error
+        return self.outcome or 'stopped'
+
+    def stop(self, outcome: str = 'stopped') -> None:
+        """Ask every thread to finish."""
+        if self.outcome is None:
+            self.outcome = outcome
+        self._stop.set()
+        self._actions.put(None)  # wake the action thread
+
+    def _guard(self, loop: Callable[[], None]) -> None:
+        try:
+            loop()
+        except BaseException as e:  # surface worker failures from run()
+            logger.exception("Pipeline thread failed")
+            self._error = e
+            self.stop()
+
+    def _capture_loop(self) -> None:
+        version = 0
+        while not self._stop.is_set():
+            after_action = self._completed
+            changes = self.read_changes()
+            version += 1
+            self._snapshots.put(BoardSnapshot(version, after_action, changes))
+            self._stop.wait(self.capture_interval)
+
+    def _action_loop(self) -> None:
+        while not self._stop.is_set():
+            action = self._actions.get()
+            if action is None:
+                break
+            row, col = action.cell
+            if action.kind == 'flag':
+                self.flag(row, col)
+            else:
+                self.click(row, col)  # clicking a revealed number chords it
+            self._completed = action.sequence
+
+    def _queue(self, kind: str, cell: Position) -> int:
+        self._queued += 1
+        if kind == 'click':
+            self._clicked[cell] = (self._queued, time.perf_counter())
+        elif kind == 'flag':
+            self._flagged.add(cell)
+        self._actions.put(Action(kind, cell, self._queued))
+        return self._queued
+
+    def _apply(self, snapshot: BoardSnapshot) -> bool:
+        """Apply a snapshot to the solver.
+
+        Returns:
+            bool: False if a clicked tile turned out to be a mine
+        """
+        updates = {}
+        for cell, state in snapshot.changes.items():
+            if state in (MINE, UNRECOGNIZED):
+                # A revealed mine may match no learned reference
+                if cell in self._clicked:
+                    print(f"Hit a mine at {cell}!")
+                    return False
+                continue  # one of our own flags, or a tile read again later
+            if state >= 0 and self.solver.values[cell] == UNOPENED:
+                updates[cell] = state
+        self.solver.update_cells(updates)
+        for cell in updates:
+            self._clicked.pop(cell, None)
+        return True
+
+    def _solve_loop(self) -> None:
+        observed = 0  # highest after_action seen in a snapshot
+        last_state = None
+        while not self._stop.is_set():
+            try:
+                snapshots = [self._snapshots.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            while True:
+                try:
+                    snapshots.append(self._snapshots.get_nowait())
+                except queue.Empty:
+                    break
+            for snapshot in snapshots:
+                if not self._apply(snapshot):
+                    self.stop('lost')
+                    return
+                observed = max(observed, snapshot.after_action)
+
+            if not self.solver.unopened_mask().any():
+                self.stop('won')
+                return
+            # Clicks that revealed nothing for a while are sent again
+            now = time.perf_counter()
+            for cell, (sequence, queued_at) in list(self._clicked.items()):
+                if sequence <= observed and now - queued_at > REISSUE_TIMEOUT:
+                    del self._clicked[cell]
+            settled = not self._clicked and observed >= self._queued
+            state = (self.solver.version, len(self._clicked), settled)
+            if state == last_state:
+                continue  # nothing new to decide on
+            last_state = state
+
+            result = self.solver.solve(budget_ms=self.budget_ms)
+            self.decisions += 1
+            if result.mines:
+                self.solver.update_cells({cell: MINE for cell in result.mines})
+                if self.flag is not None and not self.chord:
+                    for cell in sorted(result.mines):
+                        self._queue('flag', cell)
+            safe = result.safe - set(self._clicked)
+            if self.chord and safe:
+                for chord in self.solver.plan_chords(safe, self._flagged):
+                    for cell in sorted(chord.flags):
+                        self._queue('flag', cell)
+                    sequence = self._queue('chord', chord.number)
+                    # The opened cells are in flight like clicks: a mine among them ends the game
+                    for cell in chord.opens:
+                        self._clicked[cell] = (sequence, time.perf_counter())
+                    safe -= chord.opens
+            for cell in sorted(safe):
+                self._queue('click', cell)
+            if not result.safe and not result.mines and result.guess and settled:
+                print(f"No certain moves available, guessing cell {result.guess} "
+                      f"with confidence {result.confidence:.2f}")
+                self._queue('click', result.guess)
+            if self.max_decisions is not None and self.decisions >= self.max_decisions:
+                self.stop('stopped')
+                return
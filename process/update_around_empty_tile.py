@@ -1,66 +1,24 @@
-from collections import deque
-from read.get_tile_number import get_tile_number
-from read.capture import capture_tile
+from read.read_board_numbers import classify_changed_tiles
 
-def update_around_empty_tile(i_row, i_col, solver, board_img, tile_regions):
+def update_around_empty_tile(solver, board_img, tile_regions, changed=None):
     """
-    Perform BFS starting from an already-known empty tile.
-    Only blank tiles ('') are enqueued. Numbered tiles are updated but not enqueued.
-    """
-
-    def is_within_bounds(r, c):
-        return 0 <= r < len(solver.grid) and 0 <= c < len(solver.grid[0])
-
-    def read_and_update(r, c):
-        if solver.grid[r][c].value is not None:
-            return None  # already processed
-
-        try:
-            tile_img = capture_tile(board_img, tile_regions[r][c])
-            number = get_tile_number(tile_img)
-            if number == '':
-                solver.update_cell(r, c, 0)
-                return ''
-            elif number.isdigit():
-                solver.update_cell(r, c, int(number))
-                return number
-        except Exception as e:
-            print(f"Error reading tile at ({r}, {c}): {e}")
-        return None
+    Apply the opening revealed by an empty tile in a single pass.
 
-    visited = set()
-    queue = deque()
+    The tiles the solver still has as unknown are classified in one batch from
+    the given capture, and all revealed values are applied with one bulk
+    update instead of a tile-by-tile BFS.
 
-    # Start BFS from neighbors of the known-empty tile
-    for dr in [-1, 0, 1]:
-        for dc in [-1, 0, 1]:
-            if dr == 0 and dc == 0:
-                continue
-            nr, nc = i_row + dr, i_col + dc
-            if not is_within_bounds(nr, nc):
-                continue
+    Args:
+        solver (SolverLogic): The solver to update.
+        board_img (Frame): The capture taken after the click.
+        tile_regions (list): The regions of each tile in the board.
+        changed (np.ndarray): Optional (rows, cols) mask, e.g. from FrameDiffer.update,
+                              restricting the read to the tiles that changed.
 
-            result = read_and_update(nr, nc)
-            if result is not None:
-                visited.add((nr, nc))
-                if result == '':
-                    queue.append((nr, nc))
-
-    # Continue BFS on all revealed empty tiles
-    while queue:
-        row, col = queue.popleft()
-
-        # Explore neighbors of this empty tile
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
-                nr, nc = row + dr, col + dc
-                if not is_within_bounds(nr, nc) or (nr, nc) in visited:
-                    continue
-
-                result = read_and_update(nr, nc)
-                if result is not None:
-                    visited.add((nr, nc))
-                    if result == '':
-                        queue.append((nr, nc))
+    Returns:
+        dict: Mapping of (row, col) to the state of every classified tile.
+    """
+    unknown = solver.unopened_mask()
+    states = classify_changed_tiles(board_img, tile_regions, unknown if changed is None else changed & unknown)
+    solver.update_cells({position: value for position, value in states.items() if value >= 0})
+    return states
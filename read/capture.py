@@ -1,21 +1,41 @@
-import pyautogui
 import time
+from read.capture_backend import create_backend
 
-def get_board_region():
+backend = None  # CaptureBackend used by every grab; created on first use if not initialized
+
+def initialize_capture_backend(capture_backend):
+    """
+    Set the backend every grab goes through.
+
+    Args:
+        capture_backend (CaptureBackend): e.g. from read.capture_backend.create_backend.
+    """
+    global backend
+    if backend is not None and backend is not capture_backend:
+        backend.close()
+    backend = capture_backend
+
+def get_board_region(delay=3.0):
     """
     Prompts the user to move their mouse to the top-left and bottom-right corners of the board
     to determine the region for capturing the board.
 
+    Args:
+        delay (float): Seconds the user has to move the mouse to each corner.
+
     Returns:
         tuple: A region defined as (x, y, width, height).
     """
+    # Imported here: pyautogui needs a display as soon as it is imported
+    import pyautogui
+
     print("Move your mouse to the **TOP-LEFT** corner of the board...")
-    time.sleep(3)
+    time.sleep(delay)
     top_left = pyautogui.position()
     print(f"Top-left: {top_left}")
 
     print("Now move your mouse to the **BOTTOM-RIGHT** corner of the board...")
-    time.sleep(3)
+    time.sleep(delay)
     bottom_right = pyautogui.position()
     print(f"Bottom-right: {bottom_right}")
 
@@ -28,26 +48,77 @@ def get_board_region():
     )
     return region
 
-def capture_board(output_file, region):
+def grab_region(region):
+    """
+    Grab one rectangle of the screen through the capture backend.
+
+    The backend keeps its session open between grabs (with mss, a shared-memory
+    display connection), so the cost scales with the size of the region.
+
+    Args:
+        region (tuple): Region to capture in the format (x, y, width, height).
+
+    Returns:
+        Frame: The captured frame.
+    """
+    if backend is None:
+        initialize_capture_backend(create_backend())
+    return backend.grab(region)
+
+def tile_screen_region(board_region, tile_region):
     """
-    Captures a screenshot of the specified region and saves it to a file.
+    Convert a tile region on the board to a screen region.
+
+    Args:
+        board_region (tuple): Board region on screen (x, y, width, height).
+        tile_region (tuple): Tile region relative to the board (left, top, right, bottom).
+
+    Returns:
+        tuple: (x, y, width, height) on screen.
+    """
+    left, top, right, bottom = tile_region
+    return board_region[0] + left, board_region[1] + top, right - left, bottom - top
+
+def capture_regions(board_region, tile_regions):
+    """
+    Grab only the given tiles instead of the whole board.
+
+    Args:
+        board_region (tuple): Board region on screen (x, y, width, height).
+        tile_regions (list): Tile regions relative to the board (left, top, right, bottom).
+
+    Returns:
+        list: One Frame per tile region.
+    """
+    return [grab_region(tile_screen_region(board_region, region)) for region in tile_regions]
+
+def capture_board(region, output_file=None):
+    """
+    Captures a screenshot of the specified region into an in-memory frame.
 
     Args:
-        output_file (str): Name of the output image file (e.g., "state.png").
         region (tuple): Region to capture in the format (x, y, width, height).
+        output_file (str): Optional name of an image file (e.g., "state.png") to
+                           also write the screenshot to, in the background.
+
+    Returns:
+        Frame: The captured frame.
     """
-    screenshot = pyautogui.screenshot(region=region)
-    screenshot.save("template/" + output_file)
+    frame = grab_region(region)
+    if output_file:
+        frame.save("template/" + output_file)
+    return frame
 
 def capture_tile(image, region):
     """
     Capture a tile from the image based on the given region.
     
     Args:
-        image (PIL.Image): The image from which to capture the tile.
+        image (Frame or PIL.Image): The image from which to capture the tile.
         region (tuple): The bounding box of the region (left, top, right, bottom).
     
     Returns:
-        PIL.Image: The cropped tile image.
+        np.ndarray or PIL.Image: The tile as an array view for a Frame, or the
+                                 cropped PIL image otherwise.
     """
     return image.crop(region)
@@ -0,0 +1,277 @@
+import glob
+import os
+import threading
+import time
+import cv2
+import numpy as np
+from read.frame import Frame
+
+try:
+    import mss
+except ImportError:  # optional: fall back to pyautogui screenshots
+    mss = None
+
+class CaptureBackend:
+    """
+    Source of screen grabs. Regions are (x, y, width, height) in screen coordinates.
+
+    Backends keep their session open between grabs; call close() (or use the
+    backend as a context manager) to release it.
+    """
+
+    def grab(self, region, out=None):
+        """
+        Grab a region of the screen.
+
+        Args:
+            region (tuple): Region to capture in the format (x, y, width, height).
+            out (np.ndarray): Optional (height, width, 3) uint8 buffer to write the pixels into.
+
+        Returns:
+            Frame: The captured frame (backed by out when given).
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release the session."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class PyAutoGUIBackend(CaptureBackend):
+    """Grabs through pyautogui.screenshot (works everywhere pyautogui does, but slowly)."""
+
+    def __init__(self):
+        # Imported here: pyautogui needs a display as soon as it is imported
+        import pyautogui
+        self._pyautogui = pyautogui
+
+    def grab(self, region, out=None):
+        image = self._pyautogui.screenshot(region=region)
+        if out is None:
+            return Frame.from_image(image)
+        np.copyto(out, np.asarray(image.convert('RGB')))
+        return Frame(out)
+
+class MSSBackend(CaptureBackend):
+    """
+    Grabs through mss, keeping one open display connection per thread.
+
+    mss handles cannot be shared between threads on X11, so each thread that
+    grabs gets its own, created on first use and reused afterwards.
+    """
+
+    def __init__(self):
+        if mss is None:
+            raise RuntimeError("mss is not installed")
+        self._local = threading.local()
+        self._handles = []
+        self._lock = threading.Lock()
+
+    def _handle(self):
+        handle = getattr(self._local, 'handle', None)
+        if handle is None:
+            handle = self._local.handle = mss.mss()
+            with self._lock:
+                self._handles.append(handle)
+        return handle
+
+    def grab(self, region, out=None):
+        x, y, width, height = region
+        shot = self._handle().grab({'left': int(x), 'top': int(y), 'width': int(width), 'height': int(height)})
+        return Frame(cv2.cvtColor(np.asarray(shot), cv2.COLOR_BGRA2RGB, dst=out))
+
+    def close(self):
+        with self._lock:
+            for handle in self._handles:
+                handle.close()
+            self._handles.clear()
+        self._local = threading.local()
+
+class ReplayBackend(CaptureBackend):
+    """
+    Plays back recorded screens from a directory of images or a video file.
+
+    Useful for exercising the capture and classification path on a machine
+    without a display. Each grab returns the current recorded screen cropped
+    to the region; the recording advances on every grab (auto_advance) or
+    on explicit calls to step().
+    """
+
+    def __init__(self, path, origin=(0, 0), auto_advance=False, loop=False):
+        """
+        Args:
+            path (str): Directory of screenshots (read in name order) or a video file.
+            origin (tuple): Screen (x, y) of the recording's top-left pixel.
+            auto_advance (bool): Move to the next recorded screen after every grab.
+            loop (bool): Start over after the last screen instead of holding it.
+        """
+        self.origin = origin
+        self.auto_advance = auto_advance
+        self.loop = loop
+        self.frames = self._load(path)
+        if not self.frames:
+            raise ValueError(f"No frames found in {path}")
+        self.index = 0
+
+    @staticmethod
+    def _load(path):
+        if os.path.isdir(path):
+            files = sorted(f for ext in ('png', 'jpg', 'jpeg', 'bmp')
+                           for f in glob.glob(os.path.join(path, f'*.{ext}')))
+            return [cv2.cvtColor(cv2.imread(f), cv2.COLOR_BGR2RGB) for f in files]
+        video = cv2.VideoCapture(path)
+        frames = []
+        while True:
+            ok, frame = video.read()
+            if not ok:
+                break
+            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        video.release()
+        return frames
+
+    def step(self):
+        """
+        Move to the next recorded screen.
+
+        Returns:
+            bool: False once the recording is exhausted (and not looping).
+        """
+        if self.index + 1 < len(self.frames):
+            self.index += 1
+            return True
+        if self.loop:
+            self.index = 0
+            return True
+        return False
+
+    def grab(self, region, out=None):
+        x, y, width, height = region
+        left, top = x - self.origin[0], y - self.origin[1]
+        pixels = self.frames[self.index][top:top + height, left:left + width]
+        if self.auto_advance:
+            self.step()
+        if out is None:
+            return Frame(pixels.copy())
+        np.copyto(out, pixels)
+        return Frame(out)
+
+def create_backend(name='auto', replay_path=None):
+    """
+    Build a capture backend by name.
+
+    Args:
+        name (str): 'mss', 'pyautogui', 'replay', or 'auto' (mss if it is
+                    installed and can open the display, else pyautogui).
+        replay_path (str): Recording to play back for 'replay'.
+
+    Returns:
+        CaptureBackend: The backend.
+    """
+    if name == 'replay':
+        return ReplayBackend(replay_path, auto_advance=True)
+    if name == 'pyautogui':
+        return PyAutoGUIBackend()
+    if name == 'mss':
+        return MSSBackend()
+    if name != 'auto':
+        raise ValueError(f"Unknown capture backend: {name}")
+    if mss is not None:
+        try:
+            backend = MSSBackend()
+            backend._handle()  # fail now if the display cannot be opened
+            return backend
+        except Exception as e:
+            print(f"mss unavailable ({e}), falling back to pyautogui screenshots")
+    return PyAutoGUIBackend()
+
+class FrameStream:
+    """
+    Continuously capture one region on a background thread into a ring buffer.
+
+    The buffers are allocated once; the newest complete frame is published
+    after each grab. A frame returned by latest() stays valid until
+    ``slots - 1`` further grabs have completed, so consumers that keep frames
+    longer should copy them.
+    """
+
+    def __init__(self, backend, region, slots=4, interval=0.0):
+        """
+        Args:
+            backend (CaptureBackend): Backend to grab with.
+            region (tuple): Region to capture in the format (x, y, width, height).
+            slots (int): Number of preallocated frame buffers.
+            interval (float): Seconds to pause between grabs.
+        """
+        self.backend = backend
+        self.region = region
+        self.interval = interval
+        self.buffers = [np.empty((region[3], region[2], 3), dtype=np.uint8) for _ in range(slots)]
+        self.sequence = 0  # number of frames published
+        self._latest = None
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the capture thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='frame-stream', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the capture thread and wait for it to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run(self):
+        slot = 0
+        while not self._stop.is_set():
+            frame = self.backend.grab(self.region, out=self.buffers[slot])
+            with self._condition:
+                self.sequence += 1
+                self._latest = frame
+                self._condition.notify_all()
+            slot = (slot + 1) % len(self.buffers)
+            if self.interval:
+                time.sleep(self.interval)
+
+    def latest(self):
+        """
+        Get the newest frame.
+
+        Returns:
+            tuple: (sequence number, Frame), or (0, None) before the first grab.
+        """
+        with self._condition:
+            return self.sequence, self._latest
+
+    def wait_for_frame(self, after=None, timeout=1.0):
+        """
+        Wait for a frame newer than a given sequence number.
+
+        Args:
+            after (int): Sequence number already seen (default: the current one).
+            timeout (float): Seconds to wait at most.
+
+        Returns:
+            tuple: (sequence number, Frame) of the newest frame; the frame is
+                   the previous one if the timeout expired.
+        """
+        with self._condition:
+            if after is None:
+                after = self.sequence
+            self._condition.wait_for(lambda: self.sequence > after, timeout=timeout)
+            return self.sequence, self._latest
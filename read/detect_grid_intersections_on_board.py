@@ -1,12 +1,12 @@
 import cv2
 import numpy as np
 
-def detect_grid_intersections_on_board(board_image, intersection1_image, intersection2_image, threshold=0.99):
+def detect_grid_intersections_on_board(board_frame, intersection1_image, intersection2_image, threshold=0.99):
     """
     Detects grid intersection points on a board image using template matching with two sample intersection images.
 
     Args:
-        board_image (str): Filename of the board image (e.g., "state.png").
+        board_frame (Frame): The captured board.
         intersection1_image (str): Filename of the first intersection sample image.
         intersection2_image (str): Filename of the second intersection sample image.
         threshold (float): Matching confidence threshold (default is 0.98).
@@ -14,11 +14,7 @@ def detect_grid_intersections_on_board(board_image, intersection1_image, interse
     Returns:
         list of tuple: List of unique (x, y) positions for detected grid intersections.
     """
-    # Load the board image
-    board_img = cv2.imread("template/" + board_image)
-    if board_img is None:
-        print(f"Error: Could not load image at template/{board_image}")
-        return
+    board_img = board_frame.bgr
 
     # Load intersection sample images
     grid_sample1 = cv2.imread("template/" + intersection1_image)
@@ -28,7 +24,7 @@ def detect_grid_intersections_on_board(board_image, intersection1_image, interse
         return
 
     # Convert images to grayscale
-    board_gray = cv2.cvtColor(board_img, cv2.COLOR_BGR2GRAY)
+    board_gray = board_frame.gray
     sample1_gray = cv2.cvtColor(grid_sample1, cv2.COLOR_BGR2GRAY)
     sample2_gray = cv2.cvtColor(grid_sample2, cv2.COLOR_BGR2GRAY)
 
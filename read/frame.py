@@ -0,0 +1,97 @@
+import threading
+import cv2
+import numpy as np
+from PIL import Image
+
+class Frame:
+    """
+    A captured screenshot kept in memory.
+
+    The RGB pixels are stored once as a NumPy array; the PIL image and the
+    OpenCV (BGR / grayscale) versions are only built when first requested.
+    """
+
+    def __init__(self, array, image=None):
+        """
+        Args:
+            array (np.ndarray): RGB pixels of shape (height, width, 3).
+            image (PIL.Image): The PIL image the array came from, if any.
+        """
+        self.array = array
+        self._image = image
+        self._bgr = None
+        self._gray = None
+
+    @classmethod
+    def from_image(cls, image):
+        """
+        Wrap a PIL image (e.g. a pyautogui screenshot) in a Frame.
+
+        Args:
+            image (PIL.Image): The screenshot.
+
+        Returns:
+            Frame: The in-memory frame.
+        """
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        return cls(np.asarray(image), image)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.array if dtype is None else self.array.astype(dtype)
+
+    @property
+    def width(self):
+        return self.array.shape[1]
+
+    @property
+    def height(self):
+        return self.array.shape[0]
+
+    @property
+    def image(self):
+        """PIL view of the frame."""
+        if self._image is None:
+            self._image = Image.fromarray(self.array)
+        return self._image
+
+    @property
+    def bgr(self):
+        """OpenCV (BGR) view of the frame."""
+        if self._bgr is None:
+            self._bgr = cv2.cvtColor(self.array, cv2.COLOR_RGB2BGR)
+        return self._bgr
+
+    @property
+    def gray(self):
+        """OpenCV grayscale view of the frame."""
+        if self._gray is None:
+            self._gray = cv2.cvtColor(self.array, cv2.COLOR_RGB2GRAY)
+        return self._gray
+
+    def crop(self, region):
+        """
+        Get a region of the frame without copying.
+
+        Args:
+            region (tuple): The bounding box (left, top, right, bottom).
+
+        Returns:
+            np.ndarray: RGB view of the region.
+        """
+        left, top, right, bottom = region
+        return self.array[top:bottom, left:right]
+
+    def save(self, path):
+        """
+        Write the frame to disk on a background thread.
+
+        Args:
+            path (str): Destination file path.
+
+        Returns:
+            threading.Thread: The thread performing the write.
+        """
+        writer = threading.Thread(target=self.image.save, args=(path,))
+        writer.start()
+        return writer
@@ -154,16 +154,16 @@ def get_intersection(image, region1, region2, output_file1, output_file2):
     # draw.rectangle(region4, outline="blue")
     # debug_img.show()
 
-def get_starter_template(board_image, output_file1, output_file2):
+def get_starter_template(board_frame, output_file1, output_file2):
     """
     Detect and save two default tiles and their intersection areas.
     
     Args:
-        board_image (str): Filename of the board image inside the 'template' folder.
+        board_frame (Frame): The captured board.
         output_file1 (str): Filename to save the first tile.
         output_file2 (str): Filename to save the second tile.
     """
-    image = Image.open("template/" + board_image)
+    image = board_frame.image
 
     # Find first tile
     region1 = _detect_tile_boundaries(image)
@@ -1,12 +1,81 @@
+import hashlib
+from collections import OrderedDict
 import cv2
 import pytesseract
 import numpy as np
 from PIL import Image
+from read.tile_classifier import TileClassifier, label_to_text
 
 # Path to the Tesseract executable (update this if needed)
 pytesseract.pytesseract.tesseract_cmd = "/opt/homebrew/bin/tesseract"
 
+UNREADABLE_CACHE_SIZE = 1024  # tiles OCR could not read, remembered so they are not read again
+
+classifier = None
+_unreadable = OrderedDict()  # digest of tile pixels -> None
+
+def initialize_classifier(unopened_tiles, min_confidence=0.6):
+    """
+    Build the in-process tile classifier from the captured default tiles.
+
+    Args:
+        unopened_tiles (list): Images of unopened tiles (e.g. default_tile1/2).
+        min_confidence (float): Confidence below which Tesseract is used instead.
+    """
+    global classifier
+    classifier = TileClassifier(unopened_tiles, min_confidence=min_confidence)
+    _unreadable.clear()
+
+def calibrate_classifier(revealed_tiles):
+    """
+    Give the classifier its revealed-background references.
+
+    Args:
+        revealed_tiles (list): Images of tiles known to be open, e.g. the
+                               first click and its neighbours.
+    """
+    classifier.calibrate(revealed_tiles)
+
+def _digest(pil_image):
+    return hashlib.blake2b(np.ascontiguousarray(np.asarray(pil_image)).tobytes(), digest_size=16).digest()
+
 def get_tile_number(pil_image):
+    """
+    Read a tile, using the classifier and falling back to Tesseract when unsure.
+
+    Tiles OCR cannot read either are remembered by their pixels, so an
+    unchanged unrecognized tile is not sent to Tesseract again.
+
+    Args:
+        pil_image (PIL.Image): The tile image.
+
+    Returns:
+        str: '' for a blank tile, the digit, 'X' for a mine, '?' for an
+             unopened tile or '#' for an unrecognized one.
+    """
+    if classifier is None:
+        return ocr_tile_number(pil_image)
+
+    label, confidence = classifier.classify(pil_image)
+    if confidence >= classifier.min_confidence:
+        return label_to_text(label)
+    digest = _digest(pil_image)
+    if digest in _unreadable:
+        _unreadable.move_to_end(digest)
+        return label_to_text(label)
+
+    # Tesseract only reads digits: no single digit means it cannot tell an
+    # unopened tile or mine from a blank, so keep the classifier's label
+    number = ocr_tile_number(pil_image)
+    if len(number) != 1:
+        _unreadable[digest] = None
+        if len(_unreadable) > UNREADABLE_CACHE_SIZE:
+            _unreadable.popitem(last=False)
+        return label_to_text(label)
+    classifier.learn(pil_image, int(number))
+    return number
+
+def ocr_tile_number(pil_image):
     # Load and preprocess image
     image = np.array(pil_image)
     image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
@@ -31,4 +100,4 @@ def get_tile_number(pil_image):
     # cv2.waitKey(0)
     # cv2.destroyAllWindows()
     print(number)
-    return number
\ No newline at end of file
+    return number
@@ -1,7 +1,79 @@
+import numpy as np
+import read.get_tile_number as tile_reader
 from read.capture import capture_tile
 from read.get_tile_number import get_tile_number
+from read.tile_classifier import UNOPENED, UNRECOGNIZED, text_to_label
+from process.get_tile_region import get_tile_views, get_tiles_at
+
+def classify_board(board_image, tiles_region):
+    """
+    Classify every tile of the board in one vectorized call.
+
+    Tiles the batch pass is unsure about are re-read individually with
+    get_tile_number, which falls back to OCR.
+
+    Args:
+        board_image (np.ndarray or PIL.Image): The full board screenshot.
+        tiles_region (list): The regions of each tile in the board.
+
+    Returns:
+        np.ndarray: (rows, cols) int8 matrix of tile states (UNOPENED, MINE, UNRECOGNIZED or 0-8).
+    """
+    board = np.asarray(board_image)
+    tiles = get_tile_views(board, tiles_region)
+    states, confidences = tile_reader.classifier.classify_tiles(tiles)
+
+    for row, col in zip(*np.nonzero(confidences < tile_reader.classifier.min_confidence)):
+        states[row, col] = text_to_label(get_tile_number(tiles[row, col]))
+    return states
+
+def classify_changed_tiles(board_image, tiles_region, changed):
+    """
+    Classify only the tiles flagged in a change mask.
+
+    Args:
+        board_image (np.ndarray or Frame): The full board screenshot.
+        tiles_region (list): The regions of each tile in the board.
+        changed (np.ndarray): (rows, cols) boolean mask, e.g. from FrameDiffer.update.
+
+    Returns:
+        dict: Mapping of (row, col) to tile state (UNOPENED, MINE, UNRECOGNIZED or 0-8).
+    """
+    rows, cols = np.nonzero(changed)
+    if len(rows) == 0:
+        return {}
+    tiles = get_tiles_at(np.asarray(board_image), tiles_region, rows, cols)
+    states, confidences = tile_reader.classifier.classify_tiles(tiles)
+
+    for i in np.nonzero(confidences < tile_reader.classifier.min_confidence)[0]:
+        states[i] = text_to_label(get_tile_number(tiles[i]))
+    return {(int(r), int(c)): int(state) for r, c, state in zip(rows, cols, states)}
+
+def classify_tile_frames(tile_frames, positions):
+    """
+    Classify tiles grabbed on their own (e.g. with capture_regions).
+
+    Args:
+        tile_frames (list): One Frame or array per tile, all the same size.
+        positions (list): The (row, col) of each tile.
+
+    Returns:
+        dict: Mapping of (row, col) to tile state (UNOPENED, MINE, UNRECOGNIZED or 0-8).
+    """
+    if not positions:
+        return {}
+    tiles = np.stack([np.asarray(tile) for tile in tile_frames])
+    states, confidences = tile_reader.classifier.classify_tiles(tiles)
+
+    for i in np.nonzero(confidences < tile_reader.classifier.min_confidence)[0]:
+        states[i] = text_to_label(get_tile_number(tiles[i]))
+    return {(int(r), int(c)): int(state) for (r, c), state in zip(positions, states)}
 
 def read_board_numbers(board_image, tiles_region): 
+    if tile_reader.classifier is not None:
+        states = classify_board(board_image, tiles_region)
+        return [[None if state in (UNOPENED, UNRECOGNIZED) else int(state) for state in row] for row in states]
+
     board = [[None for _ in range(len(tiles_region[0]))] for _ in range(len(tiles_region))]
     for row in range(len(tiles_region)):
         for col in range(len(tiles_region[0])):
@@ -10,4 +82,4 @@ def read_board_numbers(board_image, tiles_region):
     return board
         
         
-        
\ No newline at end of file
+        
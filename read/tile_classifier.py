@@ -0,0 +1,267 @@
+import cv2
+import numpy as np
+
+# Tile state codes shared by the classifier and its callers
+UNOPENED = -2
+MINE = -1
+UNRECOGNIZED = -3  # background matches no reference (e.g. a revealed mine)
+
+GLYPH_SIZE = 12
+
+
+def label_to_text(label):
+    """
+    Convert a tile label to the text format returned by get_tile_number.
+
+    Args:
+        label (int): Tile label (UNOPENED, MINE, UNRECOGNIZED or 0-8).
+
+    Returns:
+        str: '?' for unopened, 'X' for a mine, '#' for unrecognized, '' for
+             blank, or the digit.
+    """
+    if label == UNOPENED:
+        return '?'
+    if label == MINE:
+        return 'X'
+    if label == UNRECOGNIZED:
+        return '#'
+    if label == 0:
+        return ''
+    return str(label)
+
+
+def text_to_label(text):
+    """
+    Convert get_tile_number text back to a tile label.
+
+    Args:
+        text (str): Text as returned by get_tile_number.
+
+    Returns:
+        int: Tile label (UNOPENED, MINE, UNRECOGNIZED or 0-8).
+    """
+    if text == '?':
+        return UNOPENED
+    if text in ('X', 'x'):
+        return MINE
+    if text == '#':
+        return UNRECOGNIZED
+    return int(text) if text else 0
+
+
+def _glyph(ink_mask):
+    """
+    Normalize a boolean ink mask to a zero-mean, unit-norm glyph vector.
+    """
+    glyph = cv2.resize(ink_mask.astype(np.float32), (GLYPH_SIZE, GLYPH_SIZE),
+                       interpolation=cv2.INTER_AREA).ravel()
+    glyph -= glyph.mean()
+    norm = np.linalg.norm(glyph)
+    return glyph / norm if norm > 0 else glyph
+
+
+class TileClassifier:
+    """
+    Classify tiles by colour and glyph correlation instead of OCR.
+
+    Every reference comes from the board being played, not from a fixed
+    palette. Unopened references are the default tiles captured during
+    setup; revealed references are added by calibrate() from tiles known to
+    be open (the neighbourhood of the first click); digit and mine
+    references are added by learn() from tiles the caller has identified,
+    e.g. by OCR. Once a digit has been learned, later tiles of the same digit
+    are matched against the colour and glyph taken from the board itself.
+    A tile that matches no reference is UNRECOGNIZED with zero confidence.
+    """
+
+    def __init__(self, unopened_tiles, min_confidence=0.6, color_tolerance=30,
+                 ink_threshold=60, min_ink_fraction=0.02):
+        """
+        Args:
+            unopened_tiles (list): Images (PIL or arrays) of unopened tiles.
+            min_confidence (float): Confidence below which callers should fall back to OCR.
+            color_tolerance (float): Max L1 distance for a colour to match a reference.
+            ink_threshold (float): L1 distance from the background that counts as ink.
+            min_ink_fraction (float): Ink fraction below which a tile is blank.
+        """
+        self.unopened_colors = np.array([self._background(t) for t in unopened_tiles], dtype=np.float32)
+        self.revealed_colors = np.empty((0, 3), dtype=np.float32)
+        self.mine_colors = np.empty((0, 3), dtype=np.float32)
+        self.digit_labels = np.empty(0, dtype=np.int8)
+        self.digit_colors = np.empty((0, 3), dtype=np.float32)
+        self.glyphs = {}
+        self.min_confidence = min_confidence
+        self.color_tolerance = color_tolerance
+        self.ink_threshold = ink_threshold
+        self.min_ink_fraction = min_ink_fraction
+
+    @staticmethod
+    def _background(tile):
+        return np.median(np.asarray(tile, dtype=np.float32)[..., :3], axis=(0, 1))
+
+    @staticmethod
+    def _nearest(colors, references):
+        """L1 distance from each colour to its nearest reference, and that reference's index."""
+        if len(references) == 0:
+            shape = colors.shape[:-1]
+            return np.full(shape, np.inf, dtype=np.float32), np.zeros(shape, dtype=np.intp)
+        distances = np.abs(colors[..., None, :] - references).sum(axis=-1)
+        return distances.min(axis=-1), distances.argmin(axis=-1)
+
+    def _add_reference(self, references, color):
+        """Append a colour unless a reference already matches it."""
+        if len(references) and np.abs(references - color).sum(axis=1).min() < self.color_tolerance:
+            return references
+        return np.vstack([references, color[None].astype(np.float32)])
+
+    @property
+    def calibrated(self):
+        """Whether any revealed reference is known yet."""
+        return len(self.revealed_colors) > 0
+
+    def calibrate(self, revealed_tiles):
+        """
+        Take revealed-background references from tiles known to be open.
+
+        Tiles whose background still matches an unopened reference (caught
+        before the reveal animation finished) are skipped.
+
+        Args:
+            revealed_tiles (list): Images (PIL or arrays) of open tiles, e.g.
+                                   the first click and its neighbours.
+        """
+        for tile in revealed_tiles:
+            background = self._background(tile)
+            if self._nearest(background, self.unopened_colors)[0] < self.color_tolerance:
+                continue
+            self.revealed_colors = self._add_reference(self.revealed_colors, background)
+
+    def classify_tiles(self, tiles):
+        """
+        Classify a batch of tiles in one vectorized pass.
+
+        Only the colour references are used here; glyph verification is left
+        to classify() for the few tiles the batch is unsure about.
+
+        Args:
+            tiles (np.ndarray): RGB tiles of shape (..., h, w, 3), e.g. the
+                                (rows, cols, h, w, 3) view of a whole board.
+
+        Returns:
+            tuple: (labels, confidences) arrays of shape tiles.shape[:-3],
+                   labels as int8 and confidences as float32.
+        """
+        tiles = np.asarray(tiles)[..., :3].astype(np.int16)
+        # The background dominates every tile, so a sparse sample gives the same median
+        background = np.median(tiles[..., ::3, ::3, :], axis=(-3, -2)).astype(np.int16)
+
+        d_unopened, _ = self._nearest(background, self.unopened_colors)
+        d_revealed, _ = self._nearest(background, self.revealed_colors)
+        d_mine, _ = self._nearest(background, self.mine_colors)
+
+        distance = np.abs(tiles - background[..., None, None, :]).sum(axis=-1)
+        ink = distance > self.ink_threshold
+        ink_count = ink.sum(axis=(-2, -1))
+        fraction = ink_count / float(ink.shape[-2] * ink.shape[-1])
+
+        # Anti-aliased edges blend into the background, so use the core strokes only
+        core_threshold = (distance * ink).sum(axis=(-2, -1)) / np.maximum(ink_count, 1)
+        core = ink & (distance >= core_threshold[..., None, None])
+        core_count = np.maximum(core.sum(axis=(-2, -1)), 1)[..., None]
+        ink_color = np.einsum('...hwc,...hw->...c', tiles, core, dtype=np.float32) / core_count
+
+        # Digits: nearest learned ink colour, unsure when the runner-up is nearly as close
+        if len(self.digit_colors):
+            digit_distances = np.abs(ink_color[..., None, :] - self.digit_colors).sum(axis=-1)
+            order = np.argsort(digit_distances, axis=-1)
+            nearest = np.take_along_axis(digit_distances, order[..., :1], axis=-1)[..., 0]
+            labels = self.digit_labels[order[..., 0]].astype(np.int8)
+            confidences = 1.0 - nearest / (2 * self.color_tolerance)
+            if len(self.digit_colors) > 1:
+                second = np.take_along_axis(digit_distances, order[..., 1:2], axis=-1)[..., 0]
+                confidences = np.minimum(confidences, 1.0 - nearest / np.maximum(second, 1e-6))
+            labels = np.where(confidences > 0, labels, UNRECOGNIZED)
+        else:
+            labels = np.full(background.shape[:-1], UNRECOGNIZED, dtype=np.int8)
+            confidences = np.zeros(background.shape[:-1], dtype=np.float32)
+
+        blank = fraction < self.min_ink_fraction
+        labels = np.where(blank, 0, labels)
+        confidences = np.where(blank, 1.0 - fraction / (2 * self.min_ink_fraction), confidences)
+        # Confidence falls to 0 as the background drifts from its reference
+        confidences = np.minimum(confidences, 1.0 - d_revealed / (2 * self.color_tolerance))
+
+        mine = (d_mine < d_revealed) & (d_mine < d_unopened)
+        labels = np.where(mine, MINE, labels)
+        confidences = np.where(mine, 1.0 - d_mine / (2 * self.color_tolerance), confidences)
+
+        unopened = (d_unopened <= d_revealed) & (d_unopened <= d_mine)
+        labels = np.where(unopened, UNOPENED, labels)
+        confidences = np.where(unopened, 1.0 - d_unopened / (2 * self.color_tolerance), confidences)
+
+        unknown = np.minimum(np.minimum(d_unopened, d_revealed), d_mine) >= self.color_tolerance
+        labels = np.where(unknown, UNRECOGNIZED, labels)
+        confidences = np.where(unknown | (labels == UNRECOGNIZED), 0.0, np.clip(confidences, 0.0, 1.0))
+
+        return labels.astype(np.int8), confidences.astype(np.float32)
+
+    def classify(self, tile):
+        """
+        Classify a single tile.
+
+        Args:
+            tile (PIL.Image or np.ndarray): RGB tile image.
+
+        Returns:
+            tuple: (label, confidence) where label is UNOPENED, MINE,
+                   UNRECOGNIZED or 0-8 and confidence is in [0, 1].
+        """
+        tile = np.asarray(tile, dtype=np.float32)[..., :3]
+        labels, confidences = self.classify_tiles(tile[None])
+        label, confidence = int(labels[0]), float(confidences[0])
+
+        reference = self.glyphs.get(label)
+        if reference is not None:
+            background = np.median(tile, axis=(0, 1))
+            ink = np.abs(tile - background).sum(axis=-1) > self.ink_threshold
+            confidence = min(confidence, float(np.dot(_glyph(ink), reference)))
+        return label, confidence
+
+    def learn(self, tile, label):
+        """
+        Add or refine references with a tile whose label is known (e.g. from OCR).
+
+        Args:
+            tile (PIL.Image or np.ndarray): RGB tile image.
+            label (int): The confirmed label of the tile.
+        """
+        tile = np.asarray(tile, dtype=np.float32)[..., :3]
+        background = np.median(tile, axis=(0, 1))
+        if label == 0:
+            self.revealed_colors = self._add_reference(self.revealed_colors, background)
+            return
+        if label == MINE:
+            self.mine_colors = self._add_reference(self.mine_colors, background)
+            return
+        if not 1 <= label <= 8:
+            return
+
+        self.revealed_colors = self._add_reference(self.revealed_colors, background)
+        distance = np.abs(tile - background).sum(axis=-1)
+        ink = distance > self.ink_threshold
+        if not ink.any():
+            return
+        core = ink & (distance >= distance[ink].mean())
+        color = tile[core].mean(axis=0)
+        known = np.nonzero(self.digit_labels == label)[0]
+        if len(known):
+            self.digit_colors[known[0]] = 0.5 * (self.digit_colors[known[0]] + color)
+        else:
+            self.digit_labels = np.append(self.digit_labels, np.int8(label))
+            self.digit_colors = np.vstack([self.digit_colors, color[None].astype(np.float32)])
+        glyph = _glyph(ink)
+        if label in self.glyphs:
+            glyph = self.glyphs[label] + glyph
+            glyph /= max(np.linalg.norm(glyph), 1e-6)
+        self.glyphs[label] = glyph
@@ -0,0 +1,92 @@
+import time
+from collections import deque
+import numpy as np
+from read.capture import grab_region, tile_screen_region
+
+class ChangeWaiter:
+    """
+    Wait for a screen region to change and settle, instead of sleeping a fixed time.
+
+    The region is polled with small grabs. Once its pixels differ from the
+    baseline and then stop changing between polls, the wait ends. The
+    timeout adapts to the settle times seen so far: a multiple of the
+    slowest recent one, clamped to [min_timeout, max_timeout].
+    """
+
+    def __init__(self, board_region, initial_timeout=1.0, min_timeout=0.15, max_timeout=3.0,
+                 poll_interval=0.01, stable_polls=2, threshold=8.0, history=50, timeout_factor=2.0):
+        """
+        Args:
+            board_region (tuple): Board region on screen (x, y, width, height).
+            initial_timeout (float): Seconds to wait before any settle time is known.
+            min_timeout (float): Lower bound of the adaptive timeout.
+            max_timeout (float): Upper bound of the adaptive timeout.
+            poll_interval (float): Seconds between polls.
+            stable_polls (int): Consecutive unchanged polls that count as settled.
+            threshold (float): Mean absolute pixel difference that counts as a change.
+            history (int): Number of recent settle times the timeout is learned from.
+            timeout_factor (float): Timeout as a multiple of the slowest recent settle time.
+        """
+        self.board_region = board_region
+        self.initial_timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.poll_interval = poll_interval
+        self.stable_polls = stable_polls
+        self.threshold = threshold
+        self.timeout_factor = timeout_factor
+        self.latencies = deque(maxlen=history)
+
+    @property
+    def timeout(self):
+        """Current timeout in seconds."""
+        if not self.latencies:
+            return self.initial_timeout
+        learned = self.timeout_factor * max(self.latencies)
+        return min(self.max_timeout, max(self.min_timeout, learned))
+
+    def grab(self, tile_region):
+        """
+        Capture a tile, e.g. as the baseline before acting on it.
+
+        Args:
+            tile_region (tuple): (left, top, right, bottom) relative to the board.
+
+        Returns:
+            np.ndarray: The tile's pixels as int16.
+        """
+        return np.asarray(grab_region(tile_screen_region(self.board_region, tile_region)), dtype=np.int16)
+
+    def _differs(self, a, b):
+        return a.shape != b.shape or np.abs(a - b).mean() > self.threshold
+
+    def wait(self, tile_region, baseline):
+        """
+        Wait until a tile differs from its baseline and has stopped changing.
+
+        Args:
+            tile_region (tuple): (left, top, right, bottom) relative to the board.
+            baseline (np.ndarray): The tile as returned by grab() before the action.
+
+        Returns:
+            float or None: Seconds until the tile settled, or None on timeout
+                           (the next timeout is then longer).
+        """
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        previous, stable = None, 0
+        while time.perf_counter() < deadline:
+            current = self.grab(tile_region)
+            if previous is not None and not self._differs(previous, current):
+                stable += 1
+            else:
+                stable = 0
+            if self._differs(baseline, current) and stable >= self.stable_polls:
+                elapsed = time.perf_counter() - start
+                self.latencies.append(elapsed)
+                return elapsed
+            previous = current
+            time.sleep(self.poll_interval)
+        # Remember the timeout as a settle time so a too-short timeout backs off
+        self.latencies.append(self.timeout)
+        return None
@@ -0,0 +1,148 @@
+"""Benchmark the solver's strength and speed on simulated games.
+
+Example:
+    python -m simulate.benchmark --games 500 --preset beginner intermediate expert \
+        --custom 20x24x99 --json bench.json
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import json
+import logging
+import time
+import tracemalloc
+
+import numpy as np
+
+from simulate.play import GameResult, play_game
+
+logger = logging.getLogger(__name__)
+
+# (rows, cols, mines) of the classic difficulties
+PRESETS = {
+    'beginner': (9, 9, 10),
+    'intermediate': (16, 16, 40),
+    'expert': (16, 30, 99),
+}
+MEMORY_SAMPLE_GAMES = 5  # games replayed under tracemalloc to measure peak memory
+
+def summarize(results: List[GameResult], wall_seconds: float) -> Dict[str, Any]:
+    """Aggregate game results into win rate, throughput and latency percentiles.
+
+    Args:
+        results: Results of the games of one board size
+        wall_seconds: Wall time taken to play them
+
+    Returns:
+        Dictionary of summary statistics
+    """
+    latencies = np.array([ms for result in results for ms in result.decision_ms])
+    moves = sum(result.clicks + result.flags + result.chords for result in results)
+    wins = sum(result.won for result in results)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+    return {
+        'games': len(results),
+        'wins': wins,
+        'win_rate': wins / len(results) if results else 0.0,
+        'guesses_per_game': sum(result.guesses for result in results) / max(len(results), 1),
+        'actions_per_game': moves / max(len(results), 1),
+        'decisions': int(len(latencies)),
+        'latency_ms': {'p50': float(p50), 'p95': float(p95), 'p99': float(p99),
+                       'max': float(latencies.max()) if len(latencies) else 0.0},
+        'total_solve_ms': float(latencies.sum()),
+        'wall_seconds': wall_seconds,
+        'games_per_second': len(results) / wall_seconds if wall_seconds else 0.0,
+        'moves_per_second': moves / wall_seconds if wall_seconds else 0.0,
+    }
+
+def peak_memory(rows: int, cols: int, mines: int, seeds: List[int], **options) -> float:
+    """Peak Python heap usage, in KiB, while playing the given games.
+
+    Measured in a separate pass because tracemalloc slows allocation down
+    and would distort the latency figures.
+    """
+    tracemalloc.start()
+    try:
+        for seed in seeds:
+            play_game(rows, cols, mines, seed=seed, **options)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+def run_benchmark(rows: int, cols: int, mines: int, games: int, seed: int = 0,
+                  tiers: Optional[List[str]] = None, budget_ms: Optional[float] = None,
+                  flag_mode: str = 'flag') -> Dict[str, Any]:
+    """Play ``games`` seeded games of one size and summarize them.
+
+    Args:
+        rows: Number of rows
+        cols: Number of columns
+        mines: Number of mines
+        games: Number of games, seeded ``seed`` to ``seed + games - 1``
+        seed: First seed
+        tiers: Deduction tiers for the solver
+        budget_ms: Time budget per SolverLogic.solve call
+        flag_mode: How mines are flagged (see simulate.play.play)
+
+    Returns:
+        Dictionary of summary statistics (see summarize), plus the board size
+        and peak memory
+    """
+    options = {'tiers': tiers, 'budget_ms': budget_ms, 'flag_mode': flag_mode}
+    start = time.perf_counter()
+    results = [play_game(rows, cols, mines, seed=s, **options) for s in range(seed, seed + games)]
+    summary = summarize(results, time.perf_counter() - start)
+    summary.update({'rows': rows, 'cols': cols, 'mines': mines, 'first_seed': seed})
+    memory_seeds = list(range(seed, seed + min(games, MEMORY_SAMPLE_GAMES)))
+    summary['peak_memory_kb'] = peak_memory(rows, cols, mines, memory_seeds, **options)
+    return summary
+
+def parse_size(text: str) -> Tuple[int, int, int]:
+    """Parse a custom board given as ROWSxCOLSxMINES, e.g. ``20x24x99``."""
+    try:
+        rows, cols, mines = (int(part) for part in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected ROWSxCOLSxMINES, got {text!r}")
+    return rows, cols, mines
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run the benchmark from the command line and return the report."""
+    parser = argparse.ArgumentParser(description="Benchmark the solver on simulated games.")
+    parser.add_argument('--games', type=int, default=100, help="games per board size")
+    parser.add_argument('--seed', type=int, default=0, help="first seed")
+    parser.add_argument('--preset', nargs='*', choices=sorted(PRESETS), default=None,
+                        help="preset difficulties (default: all unless --custom is given)")
+    parser.add_argument('--custom', nargs='*', type=parse_size, default=[],
+                        help="custom boards as ROWSxCOLSxMINES")
+    parser.add_argument('--tiers', nargs='*', default=None, help="deduction tiers for the solver")
+    parser.add_argument('--budget-ms', type=float, default=None, help="time budget per solve call")
+    parser.add_argument('--flag-mode', choices=['flag', 'none', 'chord'], default='flag',
+                        help="how mines are flagged")
+    parser.add_argument('--json', dest='json_path', default=None, help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    presets = args.preset if args.preset is not None else ([] if args.custom else list(PRESETS))
+    boards = [(name, PRESETS[name]) for name in presets]
+    boards += [(f"{r}x{c}x{m}", (r, c, m)) for r, c, m in args.custom]
+
+    report = {'games': args.games, 'seed': args.seed, 'tiers': args.tiers,
+              'budget_ms': args.budget_ms, 'flag_mode': args.flag_mode, 'boards': {}}
+    for name, (rows, cols, mines) in boards:
+        summary = run_benchmark(rows, cols, mines, args.games, seed=args.seed,
+                                tiers=args.tiers, budget_ms=args.budget_ms, flag_mode=args.flag_mode)
+        report['boards'][name] = summary
+        latency = summary['latency_ms']
+        print(f"{name:>12}: win rate {summary['win_rate']:.1%} ({summary['wins']}/{summary['games']}), "
+              f"latency p50 {latency['p50']:.2f} / p95 {latency['p95']:.2f} / p99 {latency['p99']:.2f} ms, "
+              f"solve {summary['total_solve_ms'] / 1000:.2f} s, "
+              f"{summary['actions_per_game']:.0f} actions/game, {summary['moves_per_second']:.0f} moves/s, peak {summary['peak_memory_kb']:.0f} KiB")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.json_path}")
+    return report
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""Play large numbers of simulated games across processes, resumably.
+
+Results are appended to a JSON Lines file, one game per line, as soon as
+each chunk of seeds finishes. Re-running the same command skips the seeds
+already in the file, so an interrupted run picks up where it stopped. Each
+record carries the solver settings it was played with (tiers, budget and
+flag mode); only records with the same settings count as already played.
+
+Example:
+    python -m simulate.farm --preset expert --games 1000000 --out expert.jsonl
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import argparse
+import json
+import logging
+import os
+import time
+
+from simulate.benchmark import PRESETS, parse_size
+from simulate.play import play_game
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500  # seeds per task sent to a worker
+PENDING_PER_WORKER = 4  # chunks queued per worker, bounds memory on huge runs
+
+def _run_key(rows: int, cols: int, mines: int, tiers: Optional[List[str]],
+             budget_ms: Optional[float], flag_mode: str) -> Tuple:
+    """Board size and solver settings that make two games comparable."""
+    return rows, cols, mines, None if tiers is None else tuple(tiers), budget_ms, flag_mode
+
+def _record_key(record: Dict[str, Any]) -> Tuple:
+    # Records written before the settings were stored were played with the defaults
+    return _run_key(record.get('rows'), record.get('cols'), record.get('mines'), record.get('tiers'),
+                    record.get('budget_ms'), record.get('flag_mode', 'flag'))
+
+def play_chunk(rows: int, cols: int, mines: int, seeds: List[int],
+               tiers: Optional[List[str]] = None, budget_ms: Optional[float] = None,
+               flag_mode: str = 'flag') -> List[Dict[str, Any]]:
+    """Play one chunk of seeded games in a worker process.
+
+    Returns:
+        One record per game, with per-decision latencies reduced to totals
+    """
+    records = []
+    for seed in seeds:
+        result = play_game(rows, cols, mines, seed=seed, tiers=tiers, budget_ms=budget_ms,
+                           flag_mode=flag_mode)
+        records.append({
+            'seed': seed, 'rows': rows, 'cols': cols, 'mines': mines,
+            'tiers': tiers, 'budget_ms': budget_ms, 'flag_mode': flag_mode, 'won': result.won,
+            'clicks': result.clicks, 'flags': result.flags, 'guesses': result.guesses,
+            'decisions': len(result.decision_ms),
+            'solve_ms': sum(result.decision_ms),
+            'max_decision_ms': max(result.decision_ms, default=0.0),
+        })
+    return records
+
+def completed_seeds(path: str, rows: int, cols: int, mines: int, tiers: Optional[List[str]] = None,
+                    budget_ms: Optional[float] = None, flag_mode: str = 'flag') -> Set[int]:
+    """Seeds of this board size and solver settings already recorded in a results file.
+
+    A line cut short by an interruption is ignored (its game is replayed).
+    """
+    done: Set[int] = set()
+    if not os.path.exists(path):
+        return done
+    key = _run_key(rows, cols, mines, tiers, budget_ms, flag_mode)
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if _record_key(record) == key:
+                done.add(record['seed'])
+    return done
+
+def _chunks(seeds: List[int], size: int) -> Iterator[List[int]]:
+    for start in range(0, len(seeds), size):
+        yield seeds[start:start + size]
+
+def run_farm(rows: int, cols: int, mines: int, games: int, out_path: str, first_seed: int = 0,
+             workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE,
+             tiers: Optional[List[str]] = None, budget_ms: Optional[float] = None,
+             flag_mode: str = 'flag') -> Dict[str, Any]:
+    """Play seeds ``first_seed`` .. ``first_seed + games - 1`` across worker processes.
+
+    Chunks of seeds are fanned out to a ProcessPoolExecutor with a bounded
+    number in flight; each finished chunk is appended to ``out_path`` and
+    flushed, so at most the chunks in flight are lost on interruption.
+
+    Args:
+        rows: Number of rows
+        cols: Number of columns
+        mines: Number of mines
+        games: Number of seeds to cover
+        out_path: JSON Lines file to append results to
+        first_seed: First seed
+        workers: Worker processes (defaults to the CPU count)
+        chunk_size: Seeds per task
+        tiers: Deduction tiers for the solver
+        budget_ms: Time budget per SolverLogic.solve call
+        flag_mode: How mines are flagged (see simulate.play.play)
+
+    Returns:
+        Summary of the games played in this run
+    """
+    workers = workers or os.cpu_count() or 1
+    done = completed_seeds(out_path, rows, cols, mines, tiers, budget_ms, flag_mode)
+    todo = [seed for seed in range(first_seed, first_seed + games) if seed not in done]
+    print(f"{rows}x{cols}/{mines}: {games - len(todo)} of {games} games already in {out_path}, "
+          f"playing {len(todo)} on {workers} workers")
+
+    played = wins = 0
+    start = time.perf_counter()
+    chunks = _chunks(todo, chunk_size)
+    # Start on a fresh line if the previous run was cut off mid-write
+    if os.path.exists(out_path) and os.path.getsize(out_path):
+        with open(out_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b'\n'
+    else:
+        needs_newline = False
+    with open(out_path, 'a') as out, ProcessPoolExecutor(max_workers=workers) as pool:
+        if needs_newline:
+            out.write('\n')
+        pending = set()
+        while True:
+            for seeds in chunks:
+                pending.add(pool.submit(play_chunk, rows, cols, mines, seeds, tiers, budget_ms, flag_mode))
+                if len(pending) >= workers * PENDING_PER_WORKER:
+                    break
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                records = future.result()
+                out.writelines(json.dumps(record) + '\n' for record in records)
+                played += len(records)
+                wins += sum(record['won'] for record in records)
+            out.flush()
+            elapsed = time.perf_counter() - start
+            logger.debug("%d/%d games, %.0f games/s", played, len(todo), played / elapsed)
+
+    elapsed = time.perf_counter() - start
+    summary = {'rows': rows, 'cols': cols, 'mines': mines, 'played': played, 'wins': wins,
+               'win_rate': wins / played if played else 0.0, 'wall_seconds': elapsed,
+               'games_per_second': played / elapsed if elapsed else 0.0}
+    print(f"Played {played} games in {elapsed:.1f} s ({summary['games_per_second']:.0f} games/s), "
+          f"win rate {summary['win_rate']:.1%}")
+    return summary
+
+def summarize_file(path: str, rows: int, cols: int, mines: int, tiers: Optional[List[str]] = None,
+                   budget_ms: Optional[float] = None, flag_mode: str = 'flag') -> Dict[str, Any]:
+    """Win rate and totals over every game of one board size and solver settings in a results file."""
+    key = _run_key(rows, cols, mines, tiers, budget_ms, flag_mode)
+    games = wins = 0
+    solve_ms = 0.0
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if _record_key(record) == key:
+                games += 1
+                wins += record['won']
+                solve_ms += record['solve_ms']
+    return {'games': games, 'wins': wins, 'win_rate': wins / games if games else 0.0,
+            'mean_solve_ms': solve_ms / games if games else 0.0}
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the game farm from the command line."""
+    parser = argparse.ArgumentParser(description="Play many simulated games across processes.")
+    board = parser.add_mutually_exclusive_group(required=True)
+    board.add_argument('--preset', choices=list(PRESETS))
+    board.add_argument('--custom', type=parse_size, help="board as ROWSxCOLSxMINES")
+    parser.add_argument('--games', type=int, required=True, help="number of seeds to cover")
+    parser.add_argument('--seed', type=int, default=0, help="first seed")
+    parser.add_argument('--out', required=True, help="JSON Lines results file (appended to)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="seeds per task")
+    parser.add_argument('--tiers', nargs='*', default=None, help="deduction tiers for the solver")
+    parser.add_argument('--budget-ms', type=float, default=None, help="time budget per solve call")
+    parser.add_argument('--flag-mode', choices=['flag', 'none', 'chord'], default='flag',
+                        help="how mines are flagged")
+    args = parser.parse_args(argv)
+
+    rows, cols, mines = PRESETS[args.preset] if args.preset else args.custom
+    run_farm(rows, cols, mines, args.games, args.out, first_seed=args.seed, workers=args.workers,
+             chunk_size=args.chunk_size, tiers=args.tiers, budget_ms=args.budget_ms,
+             flag_mode=args.flag_mode)
+    total = summarize_file(args.out, rows, cols, mines, args.tiers, args.budget_ms, args.flag_mode)
+    print(f"{args.out}: {total['wins']}/{total['games']} games won ({total['win_rate']:.1%})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""In-process Minesweeper game used to run the solver without a screen."""
+
+from typing import Dict, Optional, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+UNOPENED = -2  # same codes as read.tile_classifier and SolverLogic.values
+MINE = -1
+
+PLAYING = 'playing'
+WON = 'won'
+LOST = 'lost'
+
+class MinesweeperGame:
+    """A seeded Minesweeper board with first-click safety and flood reveal.
+
+    Mines are placed on the first click so that the clicked cell (and, when
+    there is room, its whole neighbourhood) is mine-free, like Google
+    Minesweeper. click() returns the cells it revealed as a
+    ``{(row, col): value}`` mapping that can be passed straight to
+    SolverLogic.update_cells.
+    """
+
+    def __init__(self, rows: int, cols: int, mines: int, seed: Optional[int] = None,
+                 first_click_safe: bool = True):
+        """Create a game.
+
+        Args:
+            rows: Number of rows
+            cols: Number of columns
+            mines: Number of mines
+            seed: Seed for the mine layout
+            first_click_safe: Place mines only after the first click, away from it
+        """
+        if not 0 < mines < rows * cols:
+            raise ValueError(f"Cannot place {mines} mines on a {rows}x{cols} board")
+        self.rows = rows
+        self.cols = cols
+        self.mines = mines
+        self.seed = seed
+        self.first_click_safe = first_click_safe
+        self._rng = np.random.default_rng(seed)
+        self._mines = np.zeros((rows, cols), dtype=bool)
+        self._numbers = np.zeros((rows, cols), dtype=np.int8)
+        self.values = np.full((rows, cols), UNOPENED, dtype=np.int8)  # what the player sees
+        self.flags = np.zeros((rows, cols), dtype=bool)
+        self.state = PLAYING
+        self.clicks = 0
+        self._revealed = 0
+        if not first_click_safe:
+            self._place_mines(None)
+
+    def _place_mines(self, first_click: Optional[Tuple[int, int]]) -> None:
+        """Lay the mines out, keeping them off the first click's neighbourhood if possible."""
+        allowed = np.ones((self.rows, self.cols), dtype=bool)
+        if first_click is not None:
+            row, col = first_click
+            neighbourhood = np.zeros_like(allowed)
+            neighbourhood[max(row - 1, 0):row + 2, max(col - 1, 0):col + 2] = True
+            if allowed.sum() - neighbourhood.sum() >= self.mines:
+                allowed &= ~neighbourhood
+            else:
+                allowed[row, col] = False
+        candidates = np.flatnonzero(allowed)
+        self._mines.flat[self._rng.choice(candidates, size=self.mines, replace=False)] = True
+
+        padded = np.pad(self._mines, 1).astype(np.int8)
+        self._numbers = sum(padded[1 + dr:1 + dr + self.rows, 1 + dc:1 + dc + self.cols]
+                            for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc).astype(np.int8)
+
+    def is_mine(self, row: int, col: int) -> bool:
+        """Whether a cell holds a mine (only meaningful once mines are placed)."""
+        return bool(self._mines[row, col])
+
+    def click(self, row: int, col: int) -> Dict[Tuple[int, int], int]:
+        """Open a cell, flooding outward from zeros.
+
+        Args:
+            row: Row index
+            col: Column index
+
+        Returns:
+            Mapping of every newly revealed (row, col) to its number; a mine
+            shows up as MINE and ends the game
+        """
+        if self.state != PLAYING or self.values[row, col] != UNOPENED or self.flags[row, col]:
+            return {}
+        if self.clicks == 0 and self.first_click_safe:
+            self._place_mines((row, col))
+        self.clicks += 1
+        return self._open(row, col)
+
+    def _open(self, row: int, col: int) -> Dict[Tuple[int, int], int]:
+        if self.state != PLAYING or self.values[row, col] != UNOPENED or self.flags[row, col]:
+            return {}
+        if self._mines[row, col]:
+            self.values[row, col] = MINE
+            self.state = LOST
+            return {(row, col): MINE}
+
+        revealed = {}
+        stack = [(row, col)]
+        while stack:
+            r, c = stack.pop()
+            if self.values[r, c] != UNOPENED or self.flags[r, c]:
+                continue
+            value = int(self._numbers[r, c])
+            self.values[r, c] = value
+            revealed[(r, c)] = value
+            if value == 0:
+                stack.extend((nr, nc) for nr in range(max(r - 1, 0), min(r + 2, self.rows))
+                             for nc in range(max(c - 1, 0), min(c + 2, self.cols)))
+        self._revealed += len(revealed)
+        if self._revealed == self.rows * self.cols - self.mines:
+            self.state = WON
+        return revealed
+
+    def chord(self, row: int, col: int) -> Dict[Tuple[int, int], int]:
+        """Open every unflagged neighbour of a number whose mines are all flagged.
+
+        Args:
+            row: Row index of a revealed number
+            col: Column index of a revealed number
+
+        Returns:
+            Mapping of every newly revealed (row, col) to its number, as click();
+            nothing happens unless the flags around the number match it
+        """
+        value = self.values[row, col]
+        if self.state != PLAYING or value <= 0:
+            return {}
+        rows = slice(max(row - 1, 0), row + 2)
+        cols = slice(max(col - 1, 0), col + 2)
+        if self.flags[rows, cols].sum() != value:
+            return {}
+        self.clicks += 1
+        revealed = {}
+        for r in range(rows.start, min(rows.stop, self.rows)):
+            for c in range(cols.start, min(cols.stop, self.cols)):
+                revealed.update(self._open(r, c))
+        return revealed
+
+    def flag(self, row: int, col: int) -> bool:
+        """Toggle the flag on an unopened cell.
+
+        Returns:
+            bool: True if the cell is flagged afterwards
+        """
+        if self.state == PLAYING and self.values[row, col] == UNOPENED:
+            self.flags[row, col] = not self.flags[row, col]
+        return bool(self.flags[row, col])
@@ -0,0 +1,103 @@
+"""Run the solve loop of main.py against a simulated game."""
+
+from typing import List, Optional
+from dataclasses import dataclass, field
+import logging
+import time
+
+from simulate.game import MinesweeperGame, PLAYING, UNOPENED, WON
+from solver.solver_logic import SolverLogic
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class GameResult:
+    """Outcome of one simulated game."""
+    seed: Optional[int]
+    rows: int
+    cols: int
+    mines: int
+    won: bool
+    clicks: int = 0
+    flags: int = 0
+    chords: int = 0
+    guesses: int = 0
+    decision_ms: List[float] = field(default_factory=list)  # wall time of each SolverLogic.solve call
+
+def play(game: MinesweeperGame, solver: SolverLogic, budget_ms: Optional[float] = None,
+         max_decisions: Optional[int] = None, flag_mode: str = 'flag') -> GameResult:
+    """Play a game to the end the way main.py does: flag mines, click safe cells, else guess.
+
+    Args:
+        game: A fresh simulated game
+        solver: A solver of the same size with no cells revealed
+        budget_ms: Time budget passed to SolverLogic.solve
+        max_decisions: Stop (as a loss) after this many solve calls
+        flag_mode: 'flag' to flag every mine on the board, 'none' to only
+            track mines in the solver, 'chord' to flag only the mines needed
+            for chords that save actions
+
+    Returns:
+        GameResult for the game
+    """
+    result = GameResult(game.seed, game.rows, game.cols, game.mines, won=False)
+    while game.state == PLAYING:
+        if max_decisions is not None and len(result.decision_ms) >= max_decisions:
+            break
+        start = time.perf_counter()
+        decision = solver.solve(budget_ms=budget_ms)
+        result.decision_ms.append((time.perf_counter() - start) * 1000.0)
+
+        if decision.mines:
+            if flag_mode == 'flag':
+                for r, c in decision.mines:
+                    game.flag(r, c)
+                result.flags += len(decision.mines)
+            solver.update_cells({cell: -1 for cell in decision.mines})
+            continue
+
+        moves = decision.safe or ({decision.guess} if decision.guess else set())
+        if not moves:
+            break
+        result.guesses += not decision.safe
+        if flag_mode == 'chord' and decision.safe:
+            placed = set(zip(*(index.tolist() for index in game.flags.nonzero())))
+            for chord in solver.plan_chords(decision.safe, placed):
+                for r, c in chord.flags:
+                    game.flag(r, c)
+                result.flags += len(chord.flags)
+                solver.update_cells(game.chord(*chord.number))
+                result.chords += 1
+            moves = {cell for cell in moves if game.values[cell] == UNOPENED}
+        for r, c in sorted(moves):
+            solver.update_cells(game.click(r, c))
+            result.clicks += 1
+            if game.state != PLAYING:
+                break
+
+    result.won = game.state == WON
+    logger.debug("Game %s on %dx%d/%d: %s after %d decisions", game.seed, game.rows, game.cols,
+                 game.mines, 'won' if result.won else 'lost', len(result.decision_ms))
+    return result
+
+def play_game(rows: int, cols: int, mines: int, seed: Optional[int] = None,
+              tiers: Optional[List[str]] = None, budget_ms: Optional[float] = None,
+              first_click_safe: bool = True, flag_mode: str = 'flag') -> GameResult:
+    """Create a seeded game and a solver for it, and play it out.
+
+    Args:
+        rows: Number of rows
+        cols: Number of columns
+        mines: Number of mines
+        seed: Seed for the mine layout and the solver's sampler
+        tiers: Deduction tiers for the solver (defaults to SolverLogic's)
+        budget_ms: Time budget passed to SolverLogic.solve
+        first_click_safe: Whether the first click is guaranteed to be safe
+        flag_mode: How mines are flagged (see play)
+
+    Returns:
+        GameResult for the game
+    """
+    game = MinesweeperGame(rows, cols, mines, seed=seed, first_click_safe=first_click_safe)
+    solver = SolverLogic(rows, cols, tiers=tiers, total_mines=mines, seed=seed)
+    return play(game, solver, budget_ms=budget_ms, flag_mode=flag_mode)
@@ -1,5 +1,6 @@
 """Minesweeper solver package."""
 
-from .solver_logic import SolverLogic, Cell
+from .solver_logic import SolverLogic, SolveResult, Cell, Chord
+from .guess import GuessScore
 
-__all__ = ['SolverLogic', 'Cell'] 
\ No newline at end of file
+__all__ = ['SolverLogic', 'SolveResult', 'Cell', 'Chord', 'GuessScore']
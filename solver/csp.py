@@ -0,0 +1,244 @@
+"""Exact constraint-satisfaction engine for frontier mine probabilities."""
+
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from dataclasses import dataclass
+from collections import OrderedDict
+from math import comb
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+Position = Tuple[int, int]
+
+DEFAULT_DENSITY = 0.16  # mine density assumed when the total mine count is unknown
+MAX_EXACT_CELLS = 48  # largest component enumerated exactly
+MAX_UNTIMED_CELLS = 32  # largest component enumerated without a deadline (about a second at worst)
+CACHE_SIZE = 4096  # memoized component enumerations
+
+class EnumerationTimeout(Exception):
+    """Raised when a component enumeration runs past its deadline."""
+
+@dataclass(frozen=True)
+class Constraint:
+    """A numbered cell's requirement on its unopened neighbours."""
+    cells: FrozenSet[Position]
+    mines: int
+
+@dataclass
+class ComponentSolutions:
+    """All consistent mine placements of one frontier component, grouped by mine count."""
+    cells: List[Position]
+    counts: Dict[int, int]  # mine count -> number of solutions
+    cell_counts: Dict[int, List[int]]  # mine count -> per-cell number of solutions with a mine
+
+def split_components(constraints: List[Constraint]) -> List[List[Constraint]]:
+    """Split constraints into groups that share no unopened cells.
+
+    Args:
+        constraints: Constraints of the whole frontier
+
+    Returns:
+        List of independent components, each a list of constraints
+    """
+    parent: Dict[Position, Position] = {}
+
+    def find(cell: Position) -> Position:
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    for constraint in constraints:
+        cells = iter(constraint.cells)
+        first = next(cells)
+        parent.setdefault(first, first)
+        for cell in cells:
+            parent.setdefault(cell, cell)
+            parent[find(cell)] = find(first)
+
+    components: Dict[Position, List[Constraint]] = {}
+    for constraint in constraints:
+        components.setdefault(find(next(iter(constraint.cells))), []).append(constraint)
+    return list(components.values())
+
+def _search_order(masks: Tuple[Tuple[int, int], ...]) -> List[int]:
+    """Order cell bits so that constraints are completed as early as possible."""
+    order: List[int] = []
+    seen = 0
+    for mask, _ in sorted(masks, key=lambda m: m[0] & -m[0]):
+        pending = mask & ~seen
+        while pending:
+            low = pending & -pending
+            order.append(low.bit_length() - 1)
+            pending ^= low
+        seen |= mask
+    return order
+
+_cache: 'OrderedDict[Tuple, ComponentSolutions]' = OrderedDict()
+
+def enumerate_component(constraints: List[Constraint], max_cells: Optional[int] = None,
+                        deadline: Optional[float] = None) -> Optional[ComponentSolutions]:
+    """Enumerate every consistent mine placement of a component.
+
+    The component is encoded canonically: cells sorted by position, each
+    constraint as an integer bitmask over those cells plus its mine count.
+    Results are memoized on that encoding, so a component that is unchanged
+    from one move to the next is never re-enumerated.
+
+    Args:
+        constraints: Constraints of one connected component
+        max_cells: Components with more cells are not enumerated (default
+            MAX_EXACT_CELLS with a deadline, MAX_UNTIMED_CELLS without one,
+            since enumeration time grows exponentially with the cell count)
+        deadline: time.perf_counter() value after which enumeration gives up
+
+    Returns:
+        ComponentSolutions (shared with the cache; do not mutate), or None if
+        the component is too large or the deadline passed
+    """
+    if max_cells is None:
+        max_cells = MAX_UNTIMED_CELLS if deadline is None else MAX_EXACT_CELLS
+    cells = sorted(set().union(*(c.cells for c in constraints)))
+    index = {cell: i for i, cell in enumerate(cells)}
+    masks = tuple(sorted({(sum(1 << index[cell] for cell in c.cells), c.mines)
+                          for c in constraints}))
+    key = (tuple(cells), masks)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+    if len(cells) > max_cells:
+        return None
+    try:
+        solutions = _enumerate_masks(key[0], masks, deadline)
+    except EnumerationTimeout:
+        logger.debug("Enumeration of %d cells ran out of time", len(cells))
+        return None
+    _cache[key] = solutions
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return solutions
+
+def _enumerate_masks(cells: Tuple[Position, ...], masks: Tuple[Tuple[int, int], ...],
+                     deadline: Optional[float] = None) -> ComponentSolutions:
+    """Backtrack over a bitmask-encoded component with forward checking.
+
+    Cells are re-numbered in search order, so after deciding bit i every
+    undecided cell has a higher bit. Each constraint touching bit i is checked
+    with two popcounts: mines already placed in it, and cells still open.
+    """
+    order = _search_order(masks)
+    position = {bit: k for k, bit in enumerate(order)}
+    remapped = []
+    for mask, count in masks:
+        bits = 0
+        while mask:
+            low = mask & -mask
+            bits |= 1 << position[low.bit_length() - 1]
+            mask ^= low
+        remapped.append((bits, count))
+
+    n = len(order)
+    # For each search step: (mask, count, number of the mask's cells decided later)
+    checks: List[List[Tuple[int, int, int]]] = [[] for _ in range(n)]
+    for bits, count in remapped:
+        for k in range(n):
+            if bits >> k & 1:
+                checks[k].append((bits, count, (bits >> (k + 1)).bit_count()))
+
+    counts: Dict[int, int] = {}
+    totals: Dict[int, List[int]] = {}
+    nodes = [0]
+
+    def search(k: int, mines: int, placed: int) -> None:
+        nodes[0] += 1
+        if deadline is not None and nodes[0] & 0x3FF == 0 and time.perf_counter() > deadline:
+            raise EnumerationTimeout()
+        if k == n:
+            counts[placed] = counts.get(placed, 0) + 1
+            cell_totals = totals.setdefault(placed, [0] * n)
+            while mines:
+                low = mines & -mines
+                cell_totals[low.bit_length() - 1] += 1
+                mines ^= low
+            return
+        for candidate in (mines, mines | (1 << k)):
+            if all((candidate & bits).bit_count() <= count <= (candidate & bits).bit_count() + later
+                   for bits, count, later in checks[k]):
+                search(k + 1, candidate, placed + (candidate != mines))
+
+    search(0, 0, 0)
+    # Map search-order totals back to the canonical cell order
+    cell_counts = {k: [t[position[i]] for i in range(n)] for k, t in totals.items()}
+    return ComponentSolutions(list(cells), counts, cell_counts)
+
+def _convolve(a: Dict[int, int], b: Dict[int, int]) -> Dict[int, int]:
+    result: Dict[int, int] = {}
+    for ka, va in a.items():
+        for kb, vb in b.items():
+            result[ka + kb] = result.get(ka + kb, 0) + va * vb
+    return result
+
+def combine_components(components: List[ComponentSolutions], unconstrained: int,
+                       remaining_mines: Optional[int] = None,
+                       density: float = DEFAULT_DENSITY) -> Tuple[Dict[Position, float], float]:
+    """Combine component solutions into exact per-cell mine probabilities.
+
+    With a known number of remaining mines every combination of component
+    solutions is weighted by the number of ways to place the leftover mines
+    among the unconstrained cells (a binomial coefficient). Without it, each
+    solution is weighted by the prior odds of ``density`` per mine.
+
+    Args:
+        components: Enumerated frontier components
+        unconstrained: Number of unopened cells not adjacent to any number
+        remaining_mines: Mines not yet flagged, or None if unknown
+        density: Prior mine density used when remaining_mines is None
+
+    Returns:
+        Tuple of (probability per frontier cell, probability of each unconstrained cell)
+    """
+    probabilities: Dict[Position, float] = {}
+
+    if remaining_mines is None:
+        odds = density / (1 - density)
+        for component in components:
+            weights = {k: count * odds ** k for k, count in component.counts.items()}
+            total = sum(weights.values())
+            for j, cell in enumerate(component.cells):
+                probabilities[cell] = sum(
+                    odds ** k * component.cell_counts[k][j] for k in component.counts) / total
+        return probabilities, density
+
+    def leftover_weight(frontier_mines: int) -> int:
+        leftover = remaining_mines - frontier_mines
+        return comb(unconstrained, leftover) if 0 <= leftover <= unconstrained else 0
+
+    for i, component in enumerate(components):
+        others: Dict[int, int] = {0: 1}
+        for j, other in enumerate(components):
+            if j != i:
+                others = _convolve(others, other.counts)
+        # Weight of this component holding k mines, summed over everything else
+        weights = {k: sum(ways * leftover_weight(k + rest) for rest, ways in others.items())
+                   for k in component.counts}
+        total = sum(component.counts[k] * w for k, w in weights.items())
+        if total == 0:
+            continue
+        for j, cell in enumerate(component.cells):
+            probabilities[cell] = sum(
+                component.cell_counts[k][j] * w for k, w in weights.items()) / total
+
+    if unconstrained == 0:
+        return probabilities, 0.0
+    everything: Dict[int, int] = {0: 1}
+    for component in components:
+        everything = _convolve(everything, component.counts)
+    total = sum(ways * leftover_weight(k) for k, ways in everything.items())
+    if total == 0:
+        # No placement matches the mine count (e.g. a misread tile): keep the prior
+        logger.debug("No frontier solution fits %d remaining mines", remaining_mines)
+        return probabilities, density
+    expected_leftover = sum(ways * leftover_weight(k) * (remaining_mines - k)
+                            for k, ways in everything.items()) / total
+    return probabilities, expected_leftover / unconstrained
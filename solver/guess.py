@@ -0,0 +1,136 @@
+"""Ranking of guesses when no cell is certainly safe."""
+
+from typing import List, Optional, Tuple
+from dataclasses import dataclass
+from math import log2
+import logging
+import time
+
+import numpy as np
+
+from .csp import Constraint, Position
+from .subset import subset_reduce
+
+logger = logging.getLogger(__name__)
+
+GUESS_TOLERANCE = 0.02  # candidates may be this much riskier than the safest cell
+MAX_CANDIDATES = 12  # candidates scored with the one-ply lookahead
+PROGRESS_WEIGHT = 0.5  # value of a guess that is certain to unlock a move, relative to its safety
+
+@dataclass
+class GuessScore:
+    """Evaluation of one candidate guess."""
+    cell: Position
+    probability: float  # probability that the cell is a mine
+    zero_chance: float  # probability that it reveals a 0 and opens a region
+    information: float  # entropy of the number it reveals, in bits
+    progress: float  # probability that it leads to a certain move
+    edge: float  # 1.0 for corners, 0.6 for edges, 0.0 for interior cells
+    score: float
+
+def _count_distribution(probabilities: List[float]) -> List[float]:
+    """Distribution of the number of mines among independent cells."""
+    distribution = [1.0]
+    for p in probabilities:
+        shifted = [0.0] + [q * p for q in distribution]
+        distribution = [q * (1 - p) for q in distribution] + [0.0]
+        distribution = [a + b for a, b in zip(distribution, shifted)]
+    return distribution
+
+def _lookahead(cell: Position, neighbors: List[Position], distribution: List[float],
+               constraints: List[Constraint], deadline: Optional[float] = None) -> float:
+    """Probability that revealing ``cell`` produces a certain move.
+
+    For every number the cell could show, its constraint is added to the
+    constraints around it and the subset reduction is run on the result.
+    The distribution treats the neighbours as independent, so some numbers
+    are impossible given the existing constraints; those found to be
+    contradictory are dropped and the rest renormalized.
+
+    Returns:
+        Probability of progress, or 0.0 if the deadline passed first
+    """
+    if not neighbors:
+        return 0.0
+    watched = set(neighbors) | {cell}
+    local = []
+    for constraint in constraints:
+        if constraint.cells & watched:
+            cells = constraint.cells - {cell}
+            if cells:
+                local.append(Constraint(cells, constraint.mines))
+    progress = possible = 0.0
+    for mines, chance in enumerate(distribution):
+        if chance <= 0.0:
+            continue
+        if deadline is not None and time.perf_counter() >= deadline:
+            return 0.0
+        result = subset_reduce(local + [Constraint(frozenset(neighbors), mines)])
+        if result is None:
+            continue  # this number cannot appear
+        possible += chance
+        safe, found = result
+        if mines == 0 or safe or found:
+            progress += chance  # a 0 opens its whole neighbourhood
+    return progress / possible if possible else 0.0
+
+def rank_guesses(probabilities: np.ndarray, unopened: np.ndarray,
+                 constraints: List[Constraint], tolerance: float = GUESS_TOLERANCE,
+                 max_candidates: int = MAX_CANDIDATES,
+                 deadline: Optional[float] = None) -> List[GuessScore]:
+    """Rank unopened cells as guesses, best first.
+
+    Cells within ``tolerance`` of the lowest mine probability are candidates
+    (those with fewer unopened neighbours first, up to ``max_candidates``).
+    Each is scored by its safety scaled up by the chance that it leads to a
+    certain move: either it reveals a 0, or the number it reveals lets the
+    subset reduction resolve a cell (a one-ply lookahead over the current
+    probabilities, treating neighbours as independent). Ties are broken by
+    the entropy of the revealed number and then by preferring corners and
+    edges.
+
+    Args:
+        probabilities: Mine probability of each cell, as computed by
+            SolverLogic.calculate_probabilities
+        unopened: Mask of unopened, unflagged cells
+        constraints: Frontier constraints, as built by SolverLogic.get_constraints
+        tolerance: Extra risk accepted for a better-scoring candidate
+        max_candidates: Number of candidates to score
+        deadline: time.perf_counter() value after which the remaining
+            candidates are ranked by probability alone
+
+    Returns:
+        List of GuessScore, best first (empty if no cell is unopened)
+    """
+    if not unopened.any():
+        return []
+    rows, cols = unopened.shape
+    lowest = float(probabilities[unopened].min())
+    candidate_rows, candidate_cols = np.nonzero(unopened & (probabilities <= lowest + tolerance))
+
+    def neighbors(row: int, col: int) -> List[Position]:
+        return [(r, c) for r in range(max(row - 1, 0), min(row + 2, rows))
+                for c in range(max(col - 1, 0), min(col + 2, cols)) if (r, c) != (row, col)]
+
+    candidates: List[Tuple[float, int, Position, List[Position]]] = []
+    for row, col in zip(candidate_rows.tolist(), candidate_cols.tolist()):
+        around = neighbors(row, col)
+        hidden = [cell for cell in around if unopened[cell]]
+        candidates.append((float(probabilities[row, col]), len(hidden), (row, col), around))
+    candidates.sort(key=lambda c: (c[0], c[1], c[2]))
+
+    scores = []
+    for probability, _, cell, around in candidates[:max_candidates]:
+        hidden = [n for n in around if unopened[n]]
+        edge = {3: 1.0, 5: 0.6}.get(len(around), 0.0)
+        distribution = _count_distribution([float(probabilities[n]) for n in hidden])
+        information = -sum(p * log2(p) for p in distribution if p > 0.0)
+        progress = 0.0
+        if deadline is None or time.perf_counter() < deadline:
+            progress = _lookahead(cell, hidden, distribution, constraints, deadline)
+        score = (1.0 - probability) * (1.0 + PROGRESS_WEIGHT * progress)
+        scores.append(GuessScore(cell, probability, distribution[0], information, progress, edge, score))
+
+    scores.sort(key=lambda s: (-s.score, -s.information, -s.edge, s.cell))
+    logger.debug("Ranked %d guess candidates, best %s", len(scores), scores[0] if scores else None)
+    return scores
@@ -0,0 +1,103 @@
+"""Gaussian-elimination deduction over the frontier constraint matrix."""
+
+from typing import Dict, List, Set, Tuple
+from fractions import Fraction
+import logging
+
+from .csp import Constraint, Position
+
+logger = logging.getLogger(__name__)
+
+Row = Dict[int, Fraction]  # sparse row: column -> non-zero coefficient
+
+def _reduce(rows: List[Tuple[Row, Fraction]]) -> List[Tuple[Row, Fraction]]:
+    """Bring a sparse system to reduced row echelon form with exact rationals.
+
+    Args:
+        rows: (sparse row, right-hand side) pairs
+
+    Returns:
+        The non-zero rows of the reduced system
+    """
+    basis: Dict[int, Tuple[Row, Fraction]] = {}
+    for row, rhs in rows:
+        row = dict(row)
+        for col in [c for c in row if c in basis]:
+            coef = row.get(col)
+            if not coef:
+                continue
+            pivot_row, pivot_rhs = basis[col]
+            for c, v in pivot_row.items():
+                value = row.get(c, 0) - coef * v
+                if value:
+                    row[c] = value
+                else:
+                    row.pop(c, None)
+            rhs -= coef * pivot_rhs
+        if not row:
+            continue
+
+        pivot = min(row)
+        scale = row[pivot]
+        row = {c: v / scale for c, v in row.items()}
+        rhs /= scale
+        # Keep the basis fully reduced: remove the new pivot from earlier rows
+        for col, (other, other_rhs) in basis.items():
+            coef = other.get(pivot)
+            if coef:
+                for c, v in row.items():
+                    value = other.get(c, 0) - coef * v
+                    if value:
+                        other[c] = value
+                    else:
+                        other.pop(c, None)
+                basis[col] = (other, other_rhs - coef * rhs)
+        basis[pivot] = (row, rhs)
+    return list(basis.values())
+
+def linear_deductions(constraints: List[Constraint]) -> Tuple[Set[Position], Set[Position]]:
+    """Find safe cells and mines from the reduced frontier constraint matrix.
+
+    The constraints form a 0/1 matrix (rows = numbered cells, columns =
+    unopened cells). After exact Gaussian elimination each row
+    ``sum(a_j x_j) = b`` with binary x_j is checked against its bounds: if b
+    equals the sum of the negative coefficients, every positive-coefficient
+    cell is safe and every negative one a mine (and symmetrically for the
+    positive sum). Resolved cells are substituted back and the system is
+    reduced again until nothing new is found. Runs in polynomial time.
+
+    Args:
+        constraints: Frontier constraints, as built by SolverLogic.get_constraints
+
+    Returns:
+        Tuple of (safe cells, mine cells)
+    """
+    cells = sorted(set().union(*(c.cells for c in constraints))) if constraints else []
+    index = {cell: i for i, cell in enumerate(cells)}
+    known: Dict[int, int] = {}
+
+    while True:
+        rows = []
+        for constraint in constraints:
+            row = {index[cell]: Fraction(1) for cell in constraint.cells if index[cell] not in known}
+            rhs = Fraction(constraint.mines - sum(known.get(index[cell], 0) for cell in constraint.cells))
+            if row:
+                rows.append((row, rhs))
+
+        found = {}
+        for row, rhs in _reduce(rows):
+            low = sum(v for v in row.values() if v < 0)
+            high = sum(v for v in row.values() if v > 0)
+            if rhs == low:
+                found.update({c: int(v < 0) for c, v in row.items()})
+            elif rhs == high:
+                found.update({c: int(v > 0) for c, v in row.items()})
+        if not found:
+            break
+        known.update(found)
+
+    safe = {cells[c] for c, value in known.items() if value == 0}
+    mines = {cells[c] for c, value in known.items() if value == 1}
+    logger.debug("Linear pass over %d constraints and %d cells: %d safe, %d mines",
+                 len(constraints), len(cells), len(safe), len(mines))
+    return safe, mines
@@ -0,0 +1,149 @@
+"""Monte Carlo estimation of mine probabilities for oversized frontier components."""
+
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+import logging
+import time
+
+import numpy as np
+
+from .csp import ComponentSolutions, Constraint, Position
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHAINS = 256  # chains advanced together as one NumPy batch
+DEFAULT_SAMPLES = 4000  # consistent configurations to collect per component
+DEFAULT_TIME_LIMIT = 0.5  # seconds
+BURN_IN_SWEEPS = 20
+BETA = 1.5  # inverse temperature on the constraint violation energy
+
+@dataclass
+class SampleEstimate:
+    """Monte Carlo estimate for one component."""
+    solutions: ComponentSolutions  # sample counts in place of exact solution counts
+    stderr: Dict[Position, float]  # standard error of each cell's mine probability
+    samples: int
+
+def _constraint_matrix(constraints: List[Constraint]) -> Tuple[List[Position], np.ndarray, np.ndarray]:
+    cells = sorted(set().union(*(c.cells for c in constraints)))
+    index = {cell: i for i, cell in enumerate(cells)}
+    matrix = np.zeros((len(constraints), len(cells)), dtype=np.int16)
+    for row, constraint in enumerate(constraints):
+        matrix[row, [index[cell] for cell in constraint.cells]] = 1
+    targets = np.array([c.mines for c in constraints], dtype=np.int16)
+    return cells, matrix, targets
+
+def _run_chains(constraints: List[Constraint], samples: int, time_limit: float,
+                chains: int, seed: Optional[int]) -> Tuple[Dict[int, int], Dict[int, np.ndarray], np.ndarray, int]:
+    """Advance a batch of heat-bath chains and tally the consistent states they visit.
+
+    Returns:
+        Tuple of (samples per mine count, per-cell mine tallies per mine count,
+        per-chain per-cell mine tallies, number of samples)
+    """
+    rng = np.random.default_rng(seed)
+    cells, matrix, targets = _constraint_matrix(constraints)
+    n = len(cells)
+    columns = matrix.T  # (n, m)
+    density = min(0.9, max(0.1, targets.sum() / max(matrix.sum(), 1)))
+    state = rng.random((chains, n)) < density
+    residual = state.astype(np.int16) @ matrix.T - targets  # (chains, m)
+
+    counts: Dict[int, int] = {}
+    tallies: Dict[int, np.ndarray] = {}
+    chain_tallies = np.zeros((chains, n), dtype=np.int64)
+    chain_samples = np.zeros(chains, dtype=np.int64)
+    collected = 0
+    deadline = time.perf_counter() + time_limit
+    batch = np.arange(chains)
+    step = 0
+
+    while collected < samples and time.perf_counter() < deadline:
+        step += 1
+        # Anneal during burn-in so chains reach consistent states quickly
+        beta = BETA * min(1.0, step / (BURN_IN_SWEEPS * n))
+        sites = rng.integers(0, n, size=chains)
+        direction = np.where(state[batch, sites], -1, 1).astype(np.int16)
+        delta = direction[:, None] * columns[sites]
+        energy_change = (np.abs(residual + delta) - np.abs(residual)).sum(axis=1)
+        accept = rng.random(chains) < 1.0 / (1.0 + np.exp(beta * energy_change))
+        state[batch[accept], sites[accept]] ^= True
+        residual[accept] += delta[accept]
+
+        if step < BURN_IN_SWEEPS * n or step % n:
+            continue
+        # Record one sample per chain and sweep from every chain sitting at zero energy
+        consistent = ~np.any(residual, axis=1)
+        if not consistent.any():
+            continue
+        good = state[consistent]
+        chain_tallies[consistent] += good
+        chain_samples[consistent] += 1
+        for mines, count in zip(*np.unique(good.sum(axis=1), return_counts=True)):
+            counts[int(mines)] = counts.get(int(mines), 0) + int(count)
+            tallies.setdefault(int(mines), np.zeros(n, dtype=np.int64))
+            tallies[int(mines)] += good[good.sum(axis=1) == mines].sum(axis=0)
+        collected += int(consistent.sum())
+
+    per_chain = chain_tallies[chain_samples > 0] / chain_samples[chain_samples > 0, None]
+    return counts, tallies, per_chain, collected
+
+def sample_component(constraints: List[Constraint], samples: int = DEFAULT_SAMPLES,
+                     time_limit: float = DEFAULT_TIME_LIMIT, chains: int = DEFAULT_CHAINS,
+                     workers: int = 1, seed: Optional[int] = None,
+                     executor: Optional[Executor] = None) -> Optional[SampleEstimate]:
+    """Estimate a component's mine probabilities by MCMC over its constraints.
+
+    Each chain runs heat-bath (Gibbs) updates on the constraint violation
+    ``sum(|A x - b|)``; all chains advance together as NumPy batches and
+    only states with zero violation are counted, so the tallies estimate the
+    uniform distribution over consistent configurations. Tallies are grouped
+    by mine count like an exact enumeration, so the result can be combined
+    with other components through the global mine count. The spread between
+    chains gives each cell's standard error.
+
+    Args:
+        constraints: Constraints of one connected component
+        samples: Consistent configurations to collect (across all workers)
+        time_limit: Seconds to sample for at most
+        chains: Chains per worker
+        workers: Processes to spread the chains over
+        seed: Seed for reproducible sampling
+        executor: Pool to run the workers in; without one a pool is started
+            (and shut down) for this call
+
+    Returns:
+        SampleEstimate, or None if no consistent configuration was found in time
+    """
+    cells = sorted(set().union(*(c.cells for c in constraints)))
+    if workers > 1:
+        seeds = np.random.SeedSequence(seed).spawn(workers)
+        arguments = ([constraints] * workers, [samples // workers] * workers, [time_limit] * workers,
+                     [chains] * workers, [int(s.generate_state(1)[0]) for s in seeds])
+        if executor is not None:
+            runs = list(executor.map(_run_chains, *arguments))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                runs = list(pool.map(_run_chains, *arguments))
+    else:
+        runs = [_run_chains(constraints, samples, time_limit, chains, seed)]
+
+    counts: Dict[int, int] = {}
+    tallies: Dict[int, np.ndarray] = {}
+    for run_counts, run_tallies, _, _ in runs:
+        for mines, count in run_counts.items():
+            counts[mines] = counts.get(mines, 0) + count
+            tallies[mines] = tallies.get(mines, 0) + run_tallies[mines]
+    collected = sum(run[3] for run in runs)
+    if not collected:
+        return None
+
+    per_chain = np.vstack([run[2] for run in runs])
+    if len(per_chain) > 1:
+        errors = per_chain.std(axis=0, ddof=1) / np.sqrt(len(per_chain))
+    else:
+        errors = np.full(len(cells), 0.5)
+    solutions = ComponentSolutions(cells, counts, {k: t.tolist() for k, t in tallies.items()})
+    logger.debug("Sampled %d configurations of a %d-cell component", collected, len(cells))
+    return SampleEstimate(solutions, dict(zip(cells, errors.tolist())), collected)
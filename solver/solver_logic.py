@@ -1,228 +1,716 @@
 """Core logic for solving Minesweeper puzzles."""
 
-from typing import List, Tuple, Set, Optional
+from typing import Dict, Iterator, List, Tuple, Set, Optional
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-from dataclasses import dataclass
 import logging
+import time
+from .csp import Constraint, combine_components, enumerate_component, split_components
+from .subset import subset_deductions
+from .linear import linear_deductions
+from .sampler import DEFAULT_TIME_LIMIT, sample_component
+from .guess import GuessScore, rank_guesses
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+UNKNOWN = -2  # value of an unopened cell in SolverLogic.values
+MINE = -1
+
+NEIGHBOR_OFFSETS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+NEIGHBORHOOD_OFFSETS = NEIGHBOR_OFFSETS + [(0, 0)]
+NEIGHBOR_ROWS, NEIGHBOR_COLS = np.array(NEIGHBOR_OFFSETS).T
+# Above this fraction of the board as dirty numbers, whole-board neighbour sums beat gathering
+DENSE_FRONTIER_FRACTION = 0.3
+
+# Deduction tiers run (cheapest first) when the trivial rules find nothing.
+# 'sampling' is not a deduction: it estimates components too large to enumerate.
+DEFAULT_TIERS = ('subset', 'sampling')
+
 class Cell:
-    """Represents a cell in the Minesweeper grid."""
-    row: int
-    col: int
-    value: Optional[int] = None  # None = unopened, -1 = mine, 0-8 = number
-    is_flagged: bool = False
-    probability: float = 0.0
+    """Lazy view of a single cell of a SolverLogic board."""
+
+    __slots__ = ('_solver', 'row', 'col')
+
+    def __init__(self, solver: 'SolverLogic', row: int, col: int):
+        self._solver = solver
+        self.row = row
+        self.col = col
+
+    @property
+    def value(self) -> Optional[int]:
+        """None = unopened, -1 = mine, 0-8 = number."""
+        value = int(self._solver.values[self.row, self.col])
+        return None if value == UNKNOWN else value
+
+    @value.setter
+    def value(self, value: Optional[int]) -> None:
+        self._solver.values[self.row, self.col] = UNKNOWN if value is None else value
+        self._solver._mark_dirty(self.row, self.col)
+
+    @property
+    def is_flagged(self) -> bool:
+        return bool(self._solver.flags[self.row, self.col])
+
+    @is_flagged.setter
+    def is_flagged(self, flagged: bool) -> None:
+        self._solver.flags[self.row, self.col] = flagged
+        self._solver._mark_dirty(self.row, self.col)
+
+    @property
+    def probability(self) -> float:
+        return float(self._solver.probabilities[self.row, self.col])
+
+    @probability.setter
+    def probability(self, probability: float) -> None:
+        self._solver.probabilities[self.row, self.col] = probability
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, Cell) and other._solver is self._solver
+                and (other.row, other.col) == (self.row, self.col))
+
+    def __hash__(self) -> int:
+        return hash((self.row, self.col))
+
+    def __repr__(self) -> str:
+        return (f"Cell(row={self.row}, col={self.col}, value={self.value}, "
+                f"is_flagged={self.is_flagged}, probability={self.probability})")
+
+class _GridRow:
+    """One row of Cell views; cells are created only when indexed."""
+
+    def __init__(self, solver: 'SolverLogic', row: int):
+        self._solver = solver
+        self._row = row
+
+    def __getitem__(self, col: int) -> Cell:
+        if col < 0:
+            col += self._solver.cols
+        if not 0 <= col < self._solver.cols:
+            raise IndexError(col)
+        return Cell(self._solver, self._row, col)
+
+    def __len__(self) -> int:
+        return self._solver.cols
+
+    def __iter__(self) -> Iterator[Cell]:
+        return (Cell(self._solver, self._row, col) for col in range(self._solver.cols))
+
+class _Grid:
+    """Compatibility view so that solver.grid[row][col] yields a Cell."""
+
+    def __init__(self, solver: 'SolverLogic'):
+        self._solver = solver
+
+    def __getitem__(self, row: int) -> _GridRow:
+        if row < 0:
+            row += self._solver.rows
+        if not 0 <= row < self._solver.rows:
+            raise IndexError(row)
+        return _GridRow(self._solver, row)
+
+    def __len__(self) -> int:
+        return self._solver.rows
+
+    def __iter__(self) -> Iterator[_GridRow]:
+        return (_GridRow(self._solver, row) for row in range(self._solver.rows))
+
+@dataclass
+class SolveResult:
+    """Outcome of SolverLogic.solve."""
+    safe: Set[Tuple[int, int]] = field(default_factory=set)  # certainly safe cells
+    mines: Set[Tuple[int, int]] = field(default_factory=set)  # newly found certain mines
+    guess: Optional[Tuple[int, int]] = None  # best guess when nothing is certain
+    confidence: float = 1.0  # probability the proposed moves are correct
+    stderr: float = 0.0  # standard error of the guess's mine probability (0 unless sampled)
+    tiers_run: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+    complete: bool = True  # False if the budget ran out before every tier finished
+
+@dataclass
+class Chord:
+    """A chord click on a number that opens its remaining neighbours at once."""
+    number: Tuple[int, int]  # the revealed number to click
+    flags: Set[Tuple[int, int]]  # mines that must be flagged on screen first
+    opens: Set[Tuple[int, int]]  # safe cells the chord opens that no earlier chord does
 
 class SolverLogic:
-    """Core logic for solving Minesweeper puzzles."""
-    
-    def __init__(self, rows: int, cols: int):
+    """Core logic for solving Minesweeper puzzles.
+
+    The board is stored in padded NumPy arrays with a one-cell border so that
+    the 3x3 neighbourhood of any cell can be sliced without bounds checks:
+    ``_values`` (int8, UNKNOWN for unopened), ``_flags`` (bool) and
+    ``_probabilities`` (float32). ``values``, ``flags`` and ``probabilities``
+    are views of the interior; ``grid`` exposes the same data as Cell views.
+
+    Changes must go through update_cell/update_cells (or Cell setters) so the
+    dirty frontier used by the deduction rules stays in sync.
+    """
+
+    def __init__(self, rows: int, cols: int, tiers: Optional[Tuple[str, ...]] = None,
+                 sampler_workers: int = 1, total_mines: Optional[int] = None,
+                 seed: Optional[int] = None):
         """Initialize the solver logic.
-        
+
         Args:
             rows: Number of rows in the grid
             cols: Number of columns in the grid
+            tiers: Deduction tiers to try after the trivial rules, from
+                'subset' and 'linear', plus 'sampling' to estimate components
+                too large to enumerate (defaults to DEFAULT_TIERS)
+            sampler_workers: Processes used by the Monte Carlo sampler; with
+                more than one, a pool is kept until close()
+            total_mines: Number of mines on the board, or None if unknown
+            seed: Seed for the Monte Carlo sampler, for reproducible games
         """
         self.rows = rows
         self.cols = cols
-        self.grid = [[Cell(r, c) for c in range(cols)] for r in range(rows)]
+        # The border is stored as revealed blanks: neither unopened nor numbered
+        self._values = np.zeros((rows + 2, cols + 2), dtype=np.int8)
+        self._values[1:-1, 1:-1] = UNKNOWN
+        self._flags = np.zeros((rows + 2, cols + 2), dtype=bool)
+        self._probabilities = np.zeros((rows + 2, cols + 2), dtype=np.float32)
+        self.values = self._values[1:-1, 1:-1]
+        self.flags = self._flags[1:-1, 1:-1]
+        self.probabilities = self._probabilities[1:-1, 1:-1]
+        self.grid = _Grid(self)
+        # Cells whose neighbourhood changed since the last deduction pass (padded)
+        self._dirty = np.zeros((rows + 2, cols + 2), dtype=bool)
+        self._certain_mines = set()
+        # Bumped on every board change; lets expensive passes skip unchanged boards
+        self.version = 0
+        tiers = tuple(DEFAULT_TIERS if tiers is None else tiers)
+        self.sampling = 'sampling' in tiers
+        self.sampler_workers = sampler_workers
+        self._sampler_rng = np.random.default_rng(seed)
+        self._sampler_pool: Optional[ProcessPoolExecutor] = None
+        self.tiers = tuple(tier for tier in tiers if tier != 'sampling')
+        self._tier_passes = {'subset': subset_deductions, 'linear': linear_deductions}
+        unknown_tiers = set(self.tiers) - set(self._tier_passes)
+        if unknown_tiers:
+            raise ValueError(f"Unknown deduction tiers: {sorted(unknown_tiers)}")
+        self._tier_versions = {}
         self.mines_found = set()
         self.safe_cells = set()
-        self.total_mines = None  # Will be set based on difficulty
-        
+        self.total_mines = total_mines  # weights probabilities and enables end-game deductions
+        self.last_sampled = 0  # cells estimated by sampling in the last probability pass
+        self.sample_errors: Dict[Tuple[int, int], float] = {}  # standard error of each sampled cell
+
+    def close(self) -> None:
+        """Shut down the sampler's worker pool, if one was started."""
+        if self._sampler_pool is not None:
+            self._sampler_pool.shutdown()
+            self._sampler_pool = None
+
     def update_cell(self, row: int, col: int, value: int) -> None:
         """Update a cell's value in the grid.
-        
+
         Args:
             row: Row index
             col: Column index
             value: Cell value (-1 for mine, 0-8 for numbers)
         """
         print(f"Updating SolverLogic cell at row={row}, col={col} with value={value}")
-        self.grid[row][col].value = value
-        if value == -1:
-            self.grid[row][col].is_flagged = True
+        self.values[row, col] = value
+        if value == MINE:
+            self.flags[row, col] = True
             self.mines_found.add((row, col))
-    
+        self._mark_dirty(row, col)
+
+    def update_cells(self, updates: Dict[Tuple[int, int], int]) -> None:
+        """Update many cells at once, e.g. every tile revealed by an opening.
+
+        Args:
+            updates: Mapping of (row, col) to cell value (-1 for mine, 0-8 for numbers)
+        """
+        if not updates:
+            return
+        rows, cols = np.array(list(updates.keys())).T
+        values = np.fromiter(updates.values(), dtype=np.int8, count=len(updates))
+        self.values[rows, cols] = values
+        mines = values == MINE
+        self.flags[rows[mines], cols[mines]] = True
+        self.mines_found.update(zip(rows[mines].tolist(), cols[mines].tolist()))
+        self._mark_dirty(rows, cols)
+        logger.debug("Bulk-updated %d cells", len(updates))
+
+    def unopened_mask(self) -> np.ndarray:
+        """Boolean (rows, cols) mask of unopened, unflagged cells."""
+        return (self.values == UNKNOWN) & ~self.flags
+
     def get_neighbors(self, row: int, col: int) -> List[Cell]:
         """Get all valid neighboring cells.
-        
+
         Args:
             row: Row index
             col: Column index
-            
+
         Returns:
             List of neighboring Cell objects
         """
-        neighbors = []
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
-                new_row, new_col = row + dr, col + dc
-                if 0 <= new_row < self.rows and 0 <= new_col < self.cols:
-                    neighbors.append(self.grid[new_row][new_col])
-        return neighbors
-    
+        return [Cell(self, row + dr, col + dc) for dr, dc in NEIGHBOR_OFFSETS
+                if 0 <= row + dr < self.rows and 0 <= col + dc < self.cols]
+
+    def _neighborhood(self, row: int, col: int) -> Tuple[int, List[Tuple[int, int]]]:
+        """Count flagged neighbours and locate unopened ones via the padded arrays.
+
+        Args:
+            row: Row index
+            col: Column index
+
+        Returns:
+            Tuple of (flagged neighbour count, list of unopened neighbour (row, col) tuples)
+        """
+        values = self._values[row:row + 3, col:col + 3]
+        flags = self._flags[row:row + 3, col:col + 3]
+        flagged = int(flags.sum())
+        dr, dc = np.nonzero((values == UNKNOWN) & ~flags)
+        return flagged, list(zip((dr + row - 1).tolist(), (dc + col - 1).tolist()))
+
+    def plan_chords(self, safe: Set[Tuple[int, int]],
+                    placed_flags: Set[Tuple[int, int]]) -> List[Chord]:
+        """Choose chords that open the given safe cells in fewer actions than clicking them.
+
+        A number qualifies when all its unopened neighbours are either in
+        ``safe`` or known mines; chording it costs one click plus a flag for
+        each of its mines not already flagged on screen. Chords are picked
+        greedily by actions saved, counting cells already opened by earlier
+        picks only once, while they save at least one action.
+
+        Args:
+            safe: Certainly safe cells to open
+            placed_flags: Mines already flagged on screen
+
+        Returns:
+            List of Chord, in the order they were chosen
+        """
+        candidates = {}
+        for row, col in safe:
+            for dr, dc in NEIGHBOR_OFFSETS:
+                r, c = row + dr, col + dc
+                if 0 <= r < self.rows and 0 <= c < self.cols and self.values[r, c] > 0:
+                    candidates[(r, c)] = None
+        for row, col in list(candidates):
+            neighbors = self._neighborhood(row, col)[1]
+            values = self._values[row:row + 3, col:col + 3]
+            dr, dc = np.nonzero(values == MINE)
+            mines = set(zip((dr + row - 1).tolist(), (dc + col - 1).tolist()))
+            if len(mines) == self.values[row, col] and all(cell in safe for cell in neighbors):
+                candidates[(row, col)] = (set(neighbors), mines)
+            else:
+                del candidates[(row, col)]
+
+        chords: List[Chord] = []
+        covered: Set[Tuple[int, int]] = set()
+        placed = set(placed_flags)
+        while candidates:
+            def saving(item):
+                opens, mines = item[1]
+                return len(opens - covered) - len(mines - placed) - 1
+            number, (opens, mines) = max(candidates.items(), key=lambda item: (saving(item), item[0]))
+            if saving((number, (opens, mines))) <= 0:
+                break
+            del candidates[number]
+            chords.append(Chord(number, mines - placed, opens - covered))
+            covered |= opens
+            placed |= mines
+        return chords
+
+    def _mark_dirty(self, rows, cols) -> None:
+        """Add the 3x3 neighbourhoods of changed cells to the dirty frontier.
+
+        Args:
+            rows: Row index or array of row indices
+            cols: Column index or array of column indices
+        """
+        self.version += 1
+        rows = np.asarray(rows) + 1
+        cols = np.asarray(cols) + 1
+        for dr, dc in NEIGHBORHOOD_OFFSETS:
+            self._dirty[rows + dr, cols + dc] = True
+
+    def _gather_neighbors(self, rows: np.ndarray, cols: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Gather the neighbourhoods of many cells at once.
+
+        Args:
+            rows: Row indices of n cells
+            cols: Column indices of n cells
+
+        Returns:
+            Tuple of (neighbour rows, neighbour cols, flagged mask, unopened mask),
+            each of shape (8, n); coordinates are in the padded arrays
+        """
+        neighbor_rows = rows[None, :] + 1 + NEIGHBOR_ROWS[:, None]
+        neighbor_cols = cols[None, :] + 1 + NEIGHBOR_COLS[:, None]
+        flags = self._flags[neighbor_rows, neighbor_cols]
+        unopened = (self._values[neighbor_rows, neighbor_cols] == UNKNOWN) & ~flags
+        return neighbor_rows, neighbor_cols, flags, unopened
+
+    def get_constraints(self) -> List[Constraint]:
+        """Build one constraint per numbered cell that still has unopened neighbours.
+
+        Returns:
+            List of Constraint objects over unopened, unflagged cells
+        """
+        rows, cols = np.nonzero(self.values > 0)
+        if len(rows) == 0:
+            return []
+        neighbor_rows, neighbor_cols, flags, unopened = self._gather_neighbors(rows, cols)
+        remaining = self.values[rows, cols] - flags.sum(axis=0)
+        constraints = []
+        for i in np.nonzero(unopened.any(axis=0))[0].tolist():
+            cells = unopened[:, i]
+            constraints.append(Constraint(
+                frozenset(zip((neighbor_rows[cells, i] - 1).tolist(), (neighbor_cols[cells, i] - 1).tolist())),
+                int(remaining[i])))
+        return constraints
+
+    def _neighbor_count(self, padded: np.ndarray) -> np.ndarray:
+        """Sum a padded mask over every cell's 8 neighbours (a 3x3 convolution).
+
+        Args:
+            padded: (rows + 2, cols + 2) boolean mask, e.g. ``_flags``
+
+        Returns:
+            (rows, cols) int8 array of neighbour counts
+        """
+        counts = np.zeros((self.rows, self.cols), dtype=np.int8)
+        for dr, dc in NEIGHBOR_OFFSETS:
+            counts += padded[1 + dr:self.rows + 1 + dr, 1 + dc:self.cols + 1 + dc]
+        return counts
+
+    def _neighbor_counts(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Count flagged and unopened neighbours of every cell.
+
+        Returns:
+            Tuple of (flagged, unopened) (rows, cols) int8 count arrays
+        """
+        unopened = (self._values == UNKNOWN) & ~self._flags
+        return self._neighbor_count(self._flags), self._neighbor_count(unopened)
+
+    def _around(self, sources: np.ndarray) -> Set[Tuple[int, int]]:
+        """Collect the unopened neighbours of every source cell.
+
+        Args:
+            sources: (rows, cols) boolean mask of numbered cells
+
+        Returns:
+            Set of (row, col) tuples
+        """
+        padded = np.zeros_like(self._flags)
+        padded[1:-1, 1:-1] = sources
+        cells = (self._neighbor_count(padded) > 0) & self.unopened_mask()
+        return set(map(tuple, np.argwhere(cells).tolist()))
+
+    def _deduce_board(self, dirty: np.ndarray) -> None:
+        """Apply the trivial rules with whole-board neighbour sums.
+
+        Used when most of the board is dirty (the first pass, a large
+        opening), where shifted slices beat gathering each number's neighbours.
+
+        Args:
+            dirty: (rows, cols) boolean mask of the numbers to evaluate
+        """
+        flagged, unopened = self._neighbor_counts()
+        # If all mines around a number are flagged, its remaining unopened cells are safe
+        safe_sources = dirty & (flagged == self.values) & (unopened > 0)
+        # If a number's remaining mines equal its unopened cells, they are all mines
+        mine_sources = dirty & (self.values - flagged == unopened) & (unopened > 0)
+        self.safe_cells |= self._around(safe_sources)
+        self._certain_mines |= self._around(mine_sources)
+        logger.debug("Evaluated %d numbers on the whole board: %d safe, %d mine sources",
+                     dirty.sum(), safe_sources.sum(), mine_sources.sum())
+
+    def _deduce_dirty(self) -> None:
+        """Apply the trivial rules to the numbered cells of the dirty frontier.
+
+        Only numbers whose neighbourhood changed since the last pass can yield
+        new deductions, so each is evaluated by gathering its 8 neighbours;
+        when the frontier covers a large part of the board, whole-board
+        neighbour sums are used instead. Results accumulate in ``safe_cells``
+        and ``_certain_mines`` and the frontier is cleared.
+        """
+        dirty = self._dirty[1:-1, 1:-1] & (self.values > 0)
+        self._dirty[:] = False
+        rows, cols = np.nonzero(dirty)
+        if len(rows) == 0:
+            return
+        if len(rows) > DENSE_FRONTIER_FRACTION * dirty.size:
+            self._deduce_board(dirty)
+            return
+
+        neighbor_rows, neighbor_cols, flags, unopened = self._gather_neighbors(rows, cols)
+        flagged = flags.sum(axis=0)
+        unopened_count = unopened.sum(axis=0)
+        values = self.values[rows, cols]
+
+        # If all mines around a number are flagged, its remaining unopened cells are safe
+        safe_sources = (flagged == values) & (unopened_count > 0)
+        # If a number's remaining mines equal its unopened cells, they are all mines
+        mine_sources = (values - flagged == unopened_count) & (unopened_count > 0)
+
+        for sources, found in ((safe_sources, self.safe_cells), (mine_sources, self._certain_mines)):
+            cells = unopened & sources[None, :]
+            found.update(zip((neighbor_rows[cells] - 1).tolist(), (neighbor_cols[cells] - 1).tolist()))
+        logger.debug("Evaluated %d dirty numbers: %d safe, %d mine sources",
+                     len(rows), safe_sources.sum(), mine_sources.sum())
+
+    def _deduce_tier(self, tier: str) -> None:
+        """Run one deduction tier over the current frontier.
+
+        'subset' is the pairwise subset reduction (catches e.g. the 1-2-1
+        pattern), 'linear' the Gaussian elimination pass. A tier is skipped if
+        the board has not changed since it last ran.
+
+        Args:
+            tier: Name of the tier
+        """
+        if self._tier_versions.get(tier) == self.version:
+            return
+        self._tier_versions[tier] = self.version
+        safe, mines = self._tier_passes[tier](self.get_constraints())
+        self.safe_cells.update(safe)
+        self._certain_mines.update(mines)
+
+    def remaining_mines(self) -> Optional[int]:
+        """Number of mines not yet flagged, or None if the total is unknown."""
+        if self.total_mines is None:
+            return None
+        return self.total_mines - int(self.flags.sum())
+
+    def _deduce_global(self) -> None:
+        """Apply the global mine count to the cells not yet resolved.
+
+        If every remaining mine is already accounted for, all other unopened
+        cells are safe; if the remaining mines equal the unresolved cells,
+        they are all mines.
+        """
+        remaining = self.remaining_mines()
+        if remaining is None:
+            return
+        unresolved = self.unopened_mask()
+        pending_mines = [cell for cell in self._certain_mines if not self.flags[cell]]
+        for cell in pending_mines + list(self.safe_cells):
+            unresolved[cell] = False
+        count = int(unresolved.sum())
+        left = remaining - len(pending_mines)
+        if count == 0 or left not in (0, count):
+            return
+        rows, cols = np.nonzero(unresolved)
+        cells = set(zip(rows.tolist(), cols.tolist()))
+        if left == 0:
+            self.safe_cells.update(cells)
+        elif left == count:
+            self._certain_mines.update(cells)
+        logger.debug("Mine count resolved %d cells (%d mines left)", count, left)
+
+    def _has_pending(self) -> bool:
+        return bool(self.safe_cells) or bool(self._certain_mines - self.mines_found)
+
+    def _deduce(self) -> None:
+        """Run the trivial rules, then each configured tier until one finds something."""
+        self._deduce_dirty()
+        self._deduce_global()
+        self._prune_safe_cells()
+        for tier in self.tiers:
+            if self._has_pending():
+                break
+            self._deduce_tier(tier)
+            self._prune_safe_cells()
+
+    def _prune_safe_cells(self) -> None:
+        """Drop safe cells that have been opened since they were found."""
+        self.safe_cells = {(r, c) for r, c in self.safe_cells
+                           if self.values[r, c] == UNKNOWN and not self.flags[r, c]}
+
     def find_safe_moves(self) -> Set[Tuple[int, int]]:
         """Find cells that are definitely safe to click.
-        
+
         Returns:
             Set of (row, col) tuples representing safe cells
         """
-        safe_cells = set()
-        
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell = self.grid[row][col]
-                if cell.value is not None and cell.value > 0:
-                    neighbors = self.get_neighbors(row, col)
-                    flagged = sum(1 for n in neighbors if n.is_flagged)
-                    unopened = [(n.row, n.col) for n in neighbors 
-                               if n.value is None and not n.is_flagged]
-                    
-                    # If all mines around this cell are flagged, remaining unopened cells are safe
-                    if flagged == cell.value and unopened:
-                        print(f"Found safe cells around ({row}, {col}) - all mines flagged")
-                        safe_cells.update(unopened)
-        
-        return safe_cells
-    
+        self._deduce()
+        return set(self.safe_cells)
+
     def find_certain_mines(self) -> Set[Tuple[int, int]]:
         """Find cells that are definitely mines.
-        
+
         Returns:
             Set of (row, col) tuples representing mine locations
         """
-        certain_mines = set()
-        
-        # First pass: Find obvious mines
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell = self.grid[row][col]
-                if cell.value is not None and cell.value > 0:
-                    neighbors = self.get_neighbors(row, col)
-                    flagged = sum(1 for n in neighbors if n.is_flagged)
-                    unopened = [(n.row, n.col) for n in neighbors 
-                               if n.value is None and not n.is_flagged]
-                    
-                    # If number of remaining mines equals number of unopened cells
-                    remaining_mines = cell.value - flagged
-                    print(f"Checking cell ({row}, {col}) with value {cell.value}")
-                    print(f"  Flagged neighbors: {flagged}")
-                    print(f"  Unopened neighbors: {len(unopened)}")
-                    print(f"  Remaining mines: {remaining_mines}")
-                    
-                    if remaining_mines == len(unopened) and unopened:
-                        print(f"  Found {len(unopened)} certain mines around ({row}, {col})")
-                        certain_mines.update(unopened)
-        
+        self._deduce()
+
         # Only return new mines that haven't been found yet
-        new_mines = certain_mines - self.mines_found
+        new_mines = self._certain_mines - self.mines_found
         if new_mines:
             print(f"Found {len(new_mines)} new certain mines: {new_mines}")
             self.mines_found.update(new_mines)
         return new_mines
-    
-    def calculate_probabilities(self) -> None:
-        """Calculate probability of each unopened cell being a mine."""
-        # Reset probabilities
-        for row in range(self.rows):
-            for col in range(self.cols):
-                self.grid[row][col].probability = 0.0
-                
-        # Calculate local constraints for each numbered cell
-        constraints = []
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell = self.grid[row][col]
-                if cell.value is not None and cell.value > 0:
-                    neighbors = self.get_neighbors(row, col)
-                    flagged = sum(1 for n in neighbors if n.is_flagged)
-                    unopened = [(n.row, n.col) for n in neighbors 
-                               if n.value is None and not n.is_flagged]
-                    if unopened:
-                        remaining_mines = cell.value - flagged
-                        if remaining_mines >= 0:
-                            # Add constraint with weight based on confidence
-                            # Higher weight for more certain constraints
-                            if remaining_mines == len(unopened):
-                                weight = 1.0  # All unopened must be mines
-                            elif remaining_mines == 0:
-                                weight = 1.0  # All unopened must be safe
-                            else:
-                                weight = 0.5  # Less certain cases
-                            constraints.append((unopened, remaining_mines, weight))
-        
-        # Update probabilities based on constraints
-        for cells, mines, weight in constraints:
-            if cells:
-                prob = (mines / len(cells)) * weight
-                for row, col in cells:
-                    # Take the maximum probability from all constraints
-                    self.grid[row][col].probability = max(self.grid[row][col].probability, prob)
-                    
-        # Add global mine density as a factor (reduced weight)
-        total_unopened = sum(1 for r in range(self.rows) for c in range(self.cols) 
-                           if self.grid[r][c].value is None and not self.grid[r][c].is_flagged)
-        if total_unopened > 0:
-            global_prob = len(self.mines_found) / total_unopened
-            for row in range(self.rows):
-                for col in range(self.cols):
-                    if self.grid[row][col].value is None and not self.grid[row][col].is_flagged:
-                        # Blend local and global probabilities (reduced global weight)
-                        self.grid[row][col].probability = (
-                            0.9 * self.grid[row][col].probability + 
-                            0.1 * global_prob
-                        )
-                        
-        # Ensure no cell has probability 0 unless we're absolutely certain
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell = self.grid[row][col]
-                if cell.value is None and not cell.is_flagged:
-                    # Only set probability to 0 if all neighbors are safe
-                    is_safe = True
-                    for dr in [-1, 0, 1]:
-                        for dc in [-1, 0, 1]:
-                            if dr == 0 and dc == 0:
-                                continue
-                            new_row, new_col = row + dr, col + dc
-                            if 0 <= new_row < self.rows and 0 <= new_col < self.cols:
-                                neighbor = self.grid[new_row][new_col]
-                                if neighbor.value is not None and neighbor.value > 0:
-                                    neighbors = self.get_neighbors(new_row, new_col)
-                                    flagged = sum(1 for n in neighbors if n.is_flagged)
-                                    unopened = [(n.row, n.col) for n in neighbors 
-                                               if n.value is None and not n.is_flagged]
-                                    if neighbor.value - flagged == len(unopened):
-                                        is_safe = False
-                                        break
-                    if not is_safe:
-                        cell.probability = max(cell.probability, 0.1)  # Minimum probability of 10%
+
+    def calculate_probabilities(self, deadline: Optional[float] = None) -> bool:
+        """Calculate the exact probability of each unopened cell being a mine.
+
+        The frontier is split into independent components, each component is
+        enumerated exactly and the results are combined with the global mine
+        count (see solver.csp). Cells found to be certainly safe or certainly
+        mines are added to the pending deductions.
+
+        Args:
+            deadline: time.perf_counter() value after which components that are
+                not yet enumerated fall back to local estimates
+
+        Returns:
+            bool: True if every component was solved exactly
+        """
+        unopened = self.unopened_mask()
+        constraints = self.get_constraints()
+        components, approximate, sampled = [], {}, set()
+        self.sample_errors = {}
+        for component in split_components(constraints):
+            solutions = enumerate_component(component, deadline=deadline)
+            if solutions is None and self.sampling:
+                # Too large to enumerate in time: estimate it by Monte Carlo sampling
+                time_limit = DEFAULT_TIME_LIMIT
+                if deadline is not None:
+                    time_limit = max(0.0, min(time_limit, deadline - time.perf_counter()))
+                if self.sampler_workers > 1 and self._sampler_pool is None:
+                    self._sampler_pool = ProcessPoolExecutor(max_workers=self.sampler_workers)
+                estimate = sample_component(component, time_limit=time_limit,
+                                            workers=self.sampler_workers,
+                                            seed=int(self._sampler_rng.integers(2 ** 32)),
+                                            executor=self._sampler_pool)
+                if estimate is not None:
+                    solutions = estimate.solutions
+                    sampled.update(solutions.cells)
+                    self.sample_errors.update(estimate.stderr)
+            if solutions is None or not solutions.counts:
+                # Too large (or inconsistent) to enumerate: fall back to the mean local ratio
+                ratios: Dict[Tuple[int, int], List[float]] = {}
+                for constraint in component:
+                    for cell in constraint.cells:
+                        ratios.setdefault(cell, []).append(constraint.mines / len(constraint.cells))
+                approximate.update({cell: sum(r) / len(r) for cell, r in ratios.items()})
+            else:
+                components.append(solutions)
+
+        frontier = sum(len(c.cells) for c in components)
+        unconstrained = int(unopened.sum()) - frontier - len(approximate)
+        remaining_mines = self.remaining_mines()
+        if remaining_mines is not None:
+            remaining_mines -= round(sum(approximate.values()))
+        probabilities, interior = combine_components(components, unconstrained, remaining_mines)
+        probabilities.update(approximate)
+
+        self.probabilities[:] = 0.0
+        self.probabilities[unopened] = interior
+        if remaining_mines is not None and unconstrained and not approximate and not sampled \
+                and interior in (0.0, 1.0):
+            # The frontier must hold all (or none) of the remaining mines: decide the interior too
+            interior_cells = unopened.copy()
+            for component in components:
+                for cell in component.cells:
+                    interior_cells[cell] = False
+            rows, cols = np.nonzero(interior_cells)
+            found = self.safe_cells if interior == 0.0 else self._certain_mines
+            found.update(zip(rows.tolist(), cols.tolist()))
+        for (row, col), probability in probabilities.items():
+            self.probabilities[row, col] = probability
+            if (row, col) in sampled:
+                continue  # estimates are never treated as certain
+            if probability == 0.0:
+                self.safe_cells.add((row, col))
+            elif probability == 1.0:
+                self._certain_mines.add((row, col))
+        logger.debug("Solved %d components, %d sampled cells, %d approximate cells, "
+                     "interior probability %.3f", len(components), len(sampled), len(approximate), interior)
+        self.last_sampled = len(sampled)
+        return not approximate and not sampled
 
     def make_educated_guess(self) -> set:
         """Make an educated guess about which cell to click next.
-        
+
         Returns:
             set: A set containing the coordinates of the cell to click
         """
-        min_probability = float('inf')
-        best_cells = set()
-        
-        for r in range(self.rows):
-            for c in range(self.cols):
-                cell = self.grid[r][c]
-                # Only consider unopened cells that aren't flagged
-                if cell.value is None and not cell.is_flagged:
-                    if cell.probability < min_probability:
-                        min_probability = cell.probability
-                        best_cells = {(r, c)}
-                    elif cell.probability == min_probability:
-                        best_cells.add((r, c))
-        
-        return best_cells
-     
\ No newline at end of file
+        self.calculate_probabilities()
+        unopened = self.unopened_mask()
+        if not unopened.any():
+            return set()
+        min_probability = self.probabilities[unopened].min()
+        rows, cols = np.nonzero(unopened & (self.probabilities == min_probability))
+        return set(zip(rows.tolist(), cols.tolist()))
+
+    def rank_guesses(self, deadline: Optional[float] = None) -> List[GuessScore]:
+        """Rank the unopened cells as guesses using the current probabilities.
+
+        Call after calculate_probabilities. Near-ties in mine probability are
+        broken by the chance of progress, information gain and board position
+        (see solver.guess).
+
+        Args:
+            deadline: time.perf_counter() value after which the lookahead stops
+
+        Returns:
+            List of GuessScore, best first
+        """
+        return rank_guesses(self.probabilities, self.unopened_mask(), self.get_constraints(),
+                            deadline=deadline)
+
+    def solve(self, budget_ms: Optional[float] = None) -> SolveResult:
+        """Run the deduction tiers from cheapest to most expensive within a time budget.
+
+        The trivial rules run first, then each configured tier ('subset',
+        'linear'), then exact enumeration, with Monte Carlo sampling for the
+        components too large to enumerate when 'sampling' is enabled. The first tier that yields certain
+        moves ends the search; once the budget is spent the best result found
+        so far is returned, falling back to the best-ranked guess.
+
+        Args:
+            budget_ms: Time budget in milliseconds, or None for no limit
+
+        Returns:
+            SolveResult with the certain moves, or a guess and its confidence
+        """
+        start = time.perf_counter()
+        deadline = None if budget_ms is None else start + budget_ms / 1000.0
+        tiers_run = ['trivial']
+        complete = True
+
+        self._deduce_dirty()
+        self._deduce_global()
+        self._prune_safe_cells()
+        for tier in self.tiers + ('exact',):
+            if self._has_pending():
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                complete = False
+                break
+            tiers_run.append(tier)
+            if tier == 'exact':
+                complete = self.calculate_probabilities(deadline)
+                if self.last_sampled:
+                    tiers_run.append('sampling')
+                self._prune_safe_cells()
+            else:
+                self._deduce_tier(tier)
+                self._prune_safe_cells()
+
+        mines = self._certain_mines - self.mines_found
+        self.mines_found.update(mines)
+        result = SolveResult(safe=set(self.safe_cells), mines=mines, tiers_run=tiers_run,
+                             complete=complete)
+        if not result.safe and not result.mines:
+            unopened = self.unopened_mask()
+            if unopened.any():
+                if 'exact' not in tiers_run:
+                    # Out of budget: only cached or tiny components are enumerated exactly
+                    self.calculate_probabilities(deadline=time.perf_counter())
+                best = self.rank_guesses(deadline)[0]
+                result.guess = best.cell
+                result.confidence = 1.0 - best.probability
+                result.stderr = self.sample_errors.get(best.cell, 0.0)
+        result.elapsed_ms = (time.perf_counter() - start) * 1000.0
+        logger.debug("solve: tiers %s, %d safe, %d mines, guess %s in %.2f ms",
+                     tiers_run, len(result.safe), len(result.mines), result.guess, result.elapsed_ms)
+        return result
+
@@ -0,0 +1,110 @@
+"""Pairwise (subset / set-difference) constraint reduction."""
+
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+
+from .csp import Constraint, Position
+
+logger = logging.getLogger(__name__)
+
+def subset_reduce(constraints: List[Constraint]) -> Optional[Tuple[Set[Position], Set[Position]]]:
+    """Find safe cells and mines by comparing overlapping pairs of constraints.
+
+    If A's cells are a subset of B's, then B - A holds exactly
+    ``B.mines - A.mines`` mines; that derived constraint is queued and reduced
+    like any other. For overlapping pairs, if B - A must hold all of B's
+    surplus (``B.mines - A.mines == |B - A|``) then B - A are mines and A - B
+    are safe. Constraints are indexed by the cells they cover, so each one is
+    only compared with the handful of constraints it shares a cell with.
+
+    If the constraints contradict each other (e.g. after a misread tile) some
+    derived constraint needs fewer than zero or more mines than it has cells,
+    and the pass stops there.
+
+    Args:
+        constraints: Frontier constraints, as built by SolverLogic.get_constraints
+
+    Returns:
+        Tuple of (safe cells, mine cells), or None if the constraints are
+        found to be inconsistent
+    """
+    safe: Set[Position] = set()
+    mines: Set[Position] = set()
+    known: Set[Constraint] = set()
+    by_cell: Dict[Position, List[Constraint]] = {}
+    queue: List[Constraint] = []
+    contradiction = False
+
+    def resolve(cells: Set[Position], found: Set[Position]) -> None:
+        # Constraints already reduced must be revisited without the resolved cells
+        found.update(cells)
+        for cell in cells:
+            queue.extend(by_cell.pop(cell, ()))
+
+    def add(constraint: Constraint) -> None:
+        nonlocal contradiction
+        # Strip cells already resolved so derived constraints stay minimal
+        cells = constraint.cells - safe - mines
+        count = constraint.mines - len(constraint.cells & mines)
+        if count < 0 or count > len(cells):
+            contradiction = True
+            return
+        if not cells:
+            return
+        if count == 0:
+            resolve(cells, safe)
+            return
+        if count == len(cells):
+            resolve(cells, mines)
+            return
+        reduced = Constraint(frozenset(cells), count)
+        if reduced in known:
+            return
+        known.add(reduced)
+        for cell in cells:
+            by_cell.setdefault(cell, []).append(reduced)
+        queue.append(reduced)
+
+    for constraint in constraints:
+        add(constraint)
+
+    while queue and not contradiction:
+        a = queue.pop()
+        if any(cell in safe or cell in mines for cell in a.cells):
+            add(a)
+            continue
+        neighbours = {id(b): b for cell in a.cells for b in by_cell.get(cell, ()) if b is not a}
+        for b in neighbours.values():
+            only_b = b.cells - a.cells
+            if not only_b:
+                continue
+            surplus = b.mines - a.mines
+            if a.cells <= b.cells:
+                add(Constraint(frozenset(only_b), surplus))
+            elif surplus == len(only_b):
+                resolve(only_b, mines)
+                resolve(a.cells - b.cells, safe)
+                add(b)
+                add(a)
+
+    if contradiction or safe & mines:
+        logger.debug("Subset pass over %d constraints found a contradiction", len(constraints))
+        return None
+    logger.debug("Subset pass over %d constraints: %d safe, %d mines",
+                 len(constraints), len(safe), len(mines))
+    return safe, mines
+
+def subset_deductions(constraints: List[Constraint]) -> Tuple[Set[Position], Set[Position]]:
+    """Run subset_reduce as a deduction tier.
+
+    Any deduction from an inconsistent system may be wrong, so nothing is
+    reported if the constraints contradict each other.
+
+    Args:
+        constraints: Frontier constraints, as built by SolverLogic.get_constraints
+
+    Returns:
+        Tuple of (safe cells, mine cells)
+    """
+    result = subset_reduce(constraints)
+    return result if result is not None else (set(), set())
@@ -0,0 +1,39 @@
+import pytest
+
+from solver.csp import MAX_UNTIMED_CELLS, Constraint, combine_components, enumerate_component
+
+def constraint(cols, mines, row=0):
+    return Constraint(frozenset((row, col) for col in cols), mines)
+
+def test_enumerate_counts_solutions_by_mine_count():
+    # x0 + x1 = 1 and x1 + x2 = 1: either the middle cell or both outer cells
+    solutions = enumerate_component([constraint([0, 1], 1), constraint([1, 2], 1)])
+    assert solutions.cells == [(0, 0), (0, 1), (0, 2)]
+    assert solutions.counts == {1: 1, 2: 1}
+    assert solutions.cell_counts == {1: [0, 1, 0], 2: [1, 0, 1]}
+
+def test_enumerate_is_cached():
+    constraints = [constraint([0, 1, 2], 1, row=1), constraint([2, 3], 1, row=1)]
+    first = enumerate_component(constraints)
+    # The same component in another order hits the cache instead of re-enumerating
+    assert enumerate_component(constraints[::-1]) is first
+
+def test_untimed_enumeration_is_capped():
+    constraints = [constraint(range(MAX_UNTIMED_CELLS + 1), 1, row=2)]
+    assert enumerate_component(constraints) is None
+    solutions = enumerate_component(constraints, max_cells=MAX_UNTIMED_CELLS + 1)
+    assert solutions.counts == {1: MAX_UNTIMED_CELLS + 1}
+
+def test_combine_weights_solutions_by_leftover_mines():
+    solutions = enumerate_component([constraint([0, 1], 1, row=3), constraint([1, 2], 1, row=3)])
+    # 2 mines left, 3 unconstrained cells: the 1-mine solution leaves comb(3, 1) = 3
+    # ways to place the other mine, the 2-mine solution only one
+    probabilities, unconstrained = combine_components([solutions], 3, remaining_mines=2)
+    assert probabilities == pytest.approx({(3, 0): 0.25, (3, 1): 0.75, (3, 2): 0.25})
+    assert unconstrained == pytest.approx(0.25)
+
+def test_combine_without_mine_count_uses_density():
+    solutions = enumerate_component([constraint([0, 1], 1, row=4)])
+    probabilities, unconstrained = combine_components([solutions], 5, density=0.2)
+    assert probabilities == pytest.approx({(4, 0): 0.5, (4, 1): 0.5})
+    assert unconstrained == 0.2
@@ -0,0 +1,47 @@
+import numpy as np
+
+from process.frame_diff import FrameDiffer
+from process.get_tile_region import get_tile_views, get_tiles_at
+
+def regions(rows, cols, size=10, pitch=12, jitter=0):
+    # (left, top, right, bottom) per tile; jitter shifts odd rows to break the uniform pitch
+    return [[(2 + c * pitch + jitter * (r % 2), 3 + r * pitch, 2 + c * pitch + jitter * (r % 2) + size,
+              3 + r * pitch + size) for c in range(cols)] for r in range(rows)]
+
+def board(height=60, width=80):
+    return np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+def expected(image, tile_regions):
+    return np.array([[image[top:bottom, left:right] for left, top, right, bottom in row]
+                     for row in tile_regions])
+
+def test_uniform_pitch_is_a_view():
+    image, tile_regions = board(), regions(4, 5)
+    tiles = get_tile_views(image, tile_regions)
+    assert np.shares_memory(tiles, image)
+    np.testing.assert_array_equal(tiles, expected(image, tile_regions))
+
+def test_uneven_pitch_is_gathered():
+    image, tile_regions = board(), regions(4, 5, jitter=1)
+    np.testing.assert_array_equal(get_tile_views(image, tile_regions), expected(image, tile_regions))
+
+def test_get_tiles_at_returns_only_the_listed_tiles():
+    image, tile_regions = board(), regions(4, 5, jitter=1)
+    rows, cols = np.array([0, 3, 1]), np.array([4, 0, 2])
+    np.testing.assert_array_equal(get_tiles_at(image, tile_regions, rows, cols),
+                                  expected(image, tile_regions)[rows, cols])
+
+def test_frame_differ_reports_changed_and_pending_tiles():
+    tile_regions = regions(4, 5)
+    differ = FrameDiffer(tile_regions)
+    first = board()
+    assert differ.update(first).all()
+
+    second = first.copy()
+    left, top, right, bottom = tile_regions[2][3]
+    second[top:bottom, left:right] = 255 - second[top:bottom, left:right]
+    assert list(zip(*differ.update(second).nonzero())) == [(2, 3)]
+
+    differ.mark_pending([(0, 1)])
+    assert list(zip(*differ.update(second).nonzero())) == [(0, 1)]
+    assert not differ.update(second).any()
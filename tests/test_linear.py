@@ -0,0 +1,27 @@
+from solver.csp import Constraint
+from solver.linear import linear_deductions
+from solver.subset import subset_deductions
+
+def constraint(cols, mines):
+    return Constraint(frozenset((0, col) for col in cols), mines)
+
+def test_one_two_one():
+    safe, mines = linear_deductions([constraint([0, 1], 1), constraint([0, 1, 2], 2),
+                                     constraint([1, 2], 1)])
+    assert safe == {(0, 1)}
+    assert mines == {(0, 0), (0, 2)}
+
+def test_finds_what_subset_reduction_misses():
+    # x4 = x2 from the first two and x0 = 1 - x2 from the third, so the last
+    # reads 1 + x3 = 1; no subset of constraints shows it
+    constraints = [constraint([1, 4], 1), constraint([1, 2], 1), constraint([0, 2], 1),
+                   constraint([0, 3, 4], 1)]
+    assert subset_deductions(constraints) == (set(), set())
+    safe, mines = linear_deductions(constraints)
+    assert safe == {(0, 3)}
+    assert mines == set()
+
+def test_undetermined_cells_are_left_alone():
+    safe, mines = linear_deductions([constraint([0, 1], 1), constraint([2, 3], 1)])
+    assert safe == set()
+    assert mines == set()
@@ -0,0 +1,29 @@
+import pytest
+
+from solver.csp import Constraint, enumerate_component
+from solver.sampler import sample_component
+
+def constraint(cols, mines):
+    return Constraint(frozenset((0, col) for col in cols), mines)
+
+CONSTRAINTS = [constraint([0, 1, 2], 1), constraint([2, 3, 4], 2), constraint([4, 5, 6], 1),
+               constraint([6, 7], 1)]
+
+def marginals(solutions):
+    total = sum(solutions.counts.values())
+    return [sum(solutions.cell_counts[k][j] for k in solutions.counts) / total
+            for j in range(len(solutions.cells))]
+
+def test_sampler_agrees_with_enumeration():
+    exact = enumerate_component(CONSTRAINTS)
+    estimate = sample_component(CONSTRAINTS, samples=4000, time_limit=5.0, seed=0)
+    assert estimate.solutions.cells == exact.cells
+    assert set(estimate.solutions.counts) <= set(exact.counts)
+    for cell, sampled, expected in zip(exact.cells, marginals(estimate.solutions), marginals(exact)):
+        assert sampled == pytest.approx(expected, abs=4 * estimate.stderr[cell] + 0.02)
+
+def test_sampler_is_seeded():
+    first = sample_component(CONSTRAINTS, samples=1000, time_limit=5.0, seed=1)
+    second = sample_component(CONSTRAINTS, samples=1000, time_limit=5.0, seed=1)
+    assert first.solutions.counts == second.solutions.counts
+    assert first.solutions.cell_counts == second.solutions.cell_counts
@@ -0,0 +1,57 @@
+from simulate.game import LOST, MINE, PLAYING, UNOPENED, MinesweeperGame
+from simulate.play import play_game
+from solver.solver_logic import SolverLogic
+
+def neighbours(game, row, col):
+    return [(r, c) for r in range(max(row - 1, 0), min(row + 2, game.rows))
+            for c in range(max(col - 1, 0), min(col + 2, game.cols)) if (r, c) != (row, col)]
+
+def test_first_click_floods_from_a_zero():
+    game = MinesweeperGame(9, 9, 10, seed=1)
+    revealed = game.click(4, 4)
+    assert revealed[(4, 4)] == 0
+    assert len(revealed) > 1
+    assert not any(game.is_mine(r, c) for r, c in revealed)
+    assert game.state == PLAYING
+
+def test_chord_opens_neighbours_once_flags_match():
+    game = MinesweeperGame(9, 9, 10, seed=2)
+    game.click(4, 4)
+    number = next(cell for cell in zip(*(game.values > 0).nonzero())
+                  if any(game.values[n] == UNOPENED and not game.is_mine(*n) for n in neighbours(game, *cell)))
+    closed = [n for n in neighbours(game, *number) if game.values[n] == UNOPENED]
+    assert game.chord(*number) == {}  # no flags yet
+    for cell in closed:
+        if game.is_mine(*cell):
+            game.flag(*cell)
+    revealed = game.chord(*number)
+    assert {cell for cell in closed if not game.is_mine(*cell)} <= set(revealed)
+    assert game.state != LOST
+
+def test_chord_with_a_wrong_flag_hits_a_mine():
+    game = MinesweeperGame(9, 9, 10, seed=2)
+    game.click(4, 4)
+    number = next(cell for cell in zip(*(game.values == 1).nonzero())
+                  if any(game.values[n] == UNOPENED and not game.is_mine(*n) for n in neighbours(game, *cell)))
+    game.flag(*next(n for n in neighbours(game, *number)
+                    if game.values[n] == UNOPENED and not game.is_mine(*n)))
+    assert MINE in game.chord(*number).values()
+    assert game.state == LOST
+
+def test_plan_chords_opens_a_satisfied_number():
+    solver = SolverLogic(3, 3)
+    solver.update_cells({(1, 1): 1, (0, 0): MINE})
+    safe = {(r, c) for r in range(3) for c in range(3)} - {(1, 1), (0, 0)}
+    chords = solver.plan_chords(safe, set())
+    assert [(chord.number, chord.flags, chord.opens) for chord in chords] == [((1, 1), {(0, 0)}, safe)]
+    # A flag already on screen is not placed again
+    assert solver.plan_chords(safe, {(0, 0)})[0].flags == set()
+    # A number with a neighbour that is not known safe cannot be chorded
+    assert solver.plan_chords(safe - {(2, 2)}, set()) == []
+
+def test_seeded_games_are_reproducible():
+    for flag_mode in ('flag', 'chord'):
+        first = play_game(9, 9, 10, seed=3, flag_mode=flag_mode)
+        second = play_game(9, 9, 10, seed=3, flag_mode=flag_mode)
+        assert (first.won, first.clicks, first.flags, first.chords) == \
+               (second.won, second.clicks, second.flags, second.chords)
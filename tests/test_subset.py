@@ -0,0 +1,20 @@
+from solver.csp import Constraint
+from solver.subset import subset_deductions
+
+def constraint(cols, mines):
+    return Constraint(frozenset((0, col) for col in cols), mines)
+
+def test_one_two_one():
+    # 1-2-1 along a wall: the outer cells are mines, the middle one is safe
+    safe, mines = subset_deductions([constraint([0, 1], 1), constraint([0, 1, 2], 2),
+                                     constraint([1, 2], 1)])
+    assert safe == {(0, 1)}
+    assert mines == {(0, 0), (0, 2)}
+
+def test_inconsistent_constraints_terminate():
+    # No placement satisfies these (as after a misread tile); the pass used
+    # to derive constraints with ever larger mine counts and never return
+    safe, mines = subset_deductions([constraint([0, 1, 2, 4], 1), constraint([1, 2, 3, 4], 2),
+                                     constraint([0, 1], 1), constraint([0, 2, 4], 2)])
+    assert safe == set()
+    assert mines == set()
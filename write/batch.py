@@ -0,0 +1,108 @@
+import math
+import pyautogui
+import write.click as click
+from write.click import click_at, flag_at
+
+def plan_path(cells, grid_coordinates, start=None, max_passes=4):
+    """
+    Order cells so the mouse travels a short path through them.
+
+    Builds a nearest-neighbour tour from the start position, then shortens it
+    with a few passes of 2-opt (reversing segments whose endpoints cross).
+
+    Args:
+        cells (iterable): (row, col) cells to visit.
+        grid_coordinates (list): The coordinates of each tile in the grid.
+        start (tuple): Starting (x, y) in grid coordinates (see mouse_start), or None
+                       to start at the first cell.
+        max_passes (int): Maximum number of 2-opt passes.
+
+    Returns:
+        list: The cells in visiting order.
+    """
+    remaining = sorted(set(cells))
+    if len(remaining) < 2:
+        return remaining
+
+    def position(cell):
+        return grid_coordinates[cell[0]][cell[1]]
+
+    def distance(a, b):
+        return math.dist(a, b)
+
+    here = start if start is not None else position(remaining[0])
+    path = []
+    while remaining:
+        nearest = min(remaining, key=lambda cell: distance(here, position(cell)))
+        remaining.remove(nearest)
+        path.append(nearest)
+        here = position(nearest)
+
+    # 2-opt on the open path; the start (if any) stays fixed at the front
+    nodes = ([start] if start is not None else []) + [position(cell) for cell in path]
+    tour = list(range(len(nodes)))
+    first = 0 if start is not None else -1
+    for _ in range(max_passes):
+        improved = False
+        for i in range(first, len(tour) - 2):
+            for j in range(i + 2, len(tour)):
+                # Reverse tour[i + 1 .. j]; i == -1 means the segment starts the path
+                before = distance(nodes[tour[j]], nodes[tour[j + 1]]) if j + 1 < len(tour) else 0.0
+                after = distance(nodes[tour[i + 1]], nodes[tour[j + 1]]) if j + 1 < len(tour) else 0.0
+                if i >= 0:
+                    before += distance(nodes[tour[i]], nodes[tour[i + 1]])
+                    after += distance(nodes[tour[i]], nodes[tour[j]])
+                if after < before - 1e-9:
+                    tour[i + 1:j + 1] = tour[i + 1:j + 1][::-1]
+                    improved = True
+        if not improved:
+            break
+    cells_by_node = ([None] if start is not None else []) + path
+    return [cells_by_node[n] for n in tour if cells_by_node[n] is not None]
+
+def mouse_start(board_origin=None):
+    """
+    Get the mouse position in the grid coordinates plan_path measures in.
+
+    click_at lands on the centre of a tile, half a tile past its grid
+    coordinate, so the mouse is shifted back by the same amount: the distance
+    to a cell is then the distance to the point that will be clicked.
+
+    Args:
+        board_origin (tuple): Screen (x, y) of the board, or None for the
+                              origin set by initialization_click.
+
+    Returns:
+        tuple: The mouse (x, y) in grid coordinates.
+    """
+    origin = click.board_start if board_origin is None else board_origin
+    mouse = pyautogui.position()
+    return (mouse[0] - origin[0] - click.tile_width // 2,
+            mouse[1] - origin[1] - click.tile_height // 2)
+
+def dispatch_batch(cells, grid_coordinates, board_origin=None, flag=False, plan=True):
+    """
+    Click (or flag) a set of cells back-to-back along a short mouse path.
+
+    No screenshots are taken in between; the caller verifies the whole batch
+    afterwards.
+
+    Args:
+        cells (iterable): (row, col) cells to act on.
+        grid_coordinates (list): The coordinates of each tile in the grid.
+        board_origin (tuple): Screen (x, y) of the board, to start from the current mouse
+                              position; None for the origin set by initialization_click.
+        flag (bool): Flag the cells instead of clicking them.
+        plan (bool): Order the cells with plan_path; if False they are used in the given order.
+
+    Returns:
+        list: The cells in the order they were acted on.
+    """
+    if plan:
+        order = plan_path(cells, grid_coordinates, mouse_start(board_origin))
+    else:
+        order = list(cells)
+    act = flag_at if flag else click_at
+    for row, col in order:
+        act(grid_coordinates[row][col][0], grid_coordinates[row][col][1])
+    return order